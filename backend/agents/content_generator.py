@@ -98,6 +98,32 @@ def _parse_llm_json(response) -> dict:
         raise
 
 
+_MCQ_INSTRUCTIONS = """Generate a multiple choice question to test understanding of the concept given below.
+
+Requirements:
+1. Create a clear, unambiguous question
+2. Provide exactly {num_options} options (A, B, C, D)
+3. Only ONE option should be correct
+4. Distractors should be plausible but clearly wrong if you understand the concept
+5. For higher difficulty: use application/analysis questions instead of recall
+6. Include a brief explanation of why the correct answer is right
+7. Use the SUPPORTING FACTS (if provided) to ensure accuracy
+8. Match the DIFFICULTY LEVEL given with the concept
+
+Output JSON format:
+{{
+    "question": "The question text",
+    "options": [
+        {{"id": "A", "text": "Option A text", "is_correct": false}},
+        {{"id": "B", "text": "Option B text", "is_correct": true}},
+        {{"id": "C", "text": "Option C text", "is_correct": false}},
+        {{"id": "D", "text": "Option D text", "is_correct": false}}
+    ],
+    "explanation": "Explanation of the correct answer",
+    "difficulty": <DIFFICULTY LEVEL as an integer>
+}}"""
+
+
 class ContentGeneratorAgent:
     """
     Agent for generating various types of study content.
@@ -185,7 +211,12 @@ class ContentGeneratorAgent:
                 "(match this style and rigor):\n" + "\n\n".join(examples_text)
             )
 
-        prompt = f"""Generate a multiple choice question to test understanding of this concept.
+        # Static instructions first, then few-shots (stable per concept), then the
+        # per-call concept block, so provider prefix caching can reuse the head.
+        prompt = (
+            _MCQ_INSTRUCTIONS.format(num_options=num_options)
+            + few_shot_section
+            + f"""
 
 CONCEPT: {concept_name}
 DEFINITION: {concept_definition}
@@ -193,31 +224,9 @@ RELATED CONCEPTS: {', '.join(related_concepts[:5])}
 DIFFICULTY LEVEL: {adjusted_difficulty}/10 (1=very easy, 10=very hard)
 USER MASTERY: {mastery_score:.0%} — {"challenge with application/synthesis questions" if mastery_score > 0.6 else "focus on core understanding and recall" if mastery_score < 0.3 else "mix recall with some application"}
 
-Requirements:
-1. Create a clear, unambiguous question
-2. Provide exactly {num_options} options (A, B, C, D)
-3. Only ONE option should be correct
-4. Distractors should be plausible but clearly wrong if you understand the concept
-5. For higher difficulty: use application/analysis questions instead of recall
-6. Include a brief explanation of why the correct answer is right
-7. Use the SUPPORTING FACTS (if provided) to ensure accuracy
-
 SUPPORTING FACTS:
-{'- ' + chr(10).join(propositions[:5]) if propositions else 'None provided (General knowledge)'}
-{few_shot_section}
-
-Output JSON format:
-{{
-    "question": "The question text",
-    "options": [
-        {{"id": "A", "text": "Option A text", "is_correct": false}},
-        {{"id": "B", "text": "Option B text", "is_correct": true}},
-        {{"id": "C", "text": "Option C text", "is_correct": false}},
-        {{"id": "D", "text": "Option D text", "is_correct": false}}
-    ],
-    "explanation": "Explanation of the correct answer",
-    "difficulty": {adjusted_difficulty}
-}}"""
+{'- ' + chr(10).join(propositions[:5]) if propositions else 'None provided (General knowledge)'}"""
+        )
 
         try:
             response = await self.llm.ainvoke(prompt)
@@ -248,6 +257,7 @@ Output JSON format:
         self,
         concepts: list[dict],
         num_per_concept: int = 2,
+        max_concurrency: int = 8,
     ) -> list[MCQQuestion]:
         """
         Generate multiple MCQs for a batch of concepts using parallel LLM calls.
@@ -255,16 +265,18 @@ Output JSON format:
         Args:
             concepts: List of concept dictionaries with name, definition, etc.
             num_per_concept: Number of MCQs to generate per concept
+            max_concurrency: Cap on MCQ generations in flight at once
 
         Returns:
-            List of validated MCQQuestion objects
+            List of validated MCQQuestion objects, grouped by concept
         """
         import asyncio
 
-        async def _generate_one(concept: dict) -> list[MCQQuestion]:
-            results = []
-            for _ in range(num_per_concept):
-                try:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _generate_one(concept: dict) -> Optional[MCQQuestion]:
+            try:
+                async with semaphore:
                     mcq = await self.generate_mcq(
                         concept_name=concept["name"],
                         concept_definition=concept["definition"],
@@ -274,43 +286,47 @@ Output JSON format:
                         mastery_score=float(concept.get("mastery_score", 0.0)),
                         few_shot_examples=concept.get("few_shot_examples", []),
                     )
-                    mcq.concept_id = concept.get("id", "")
-
-                    # VALIDATION: Ensure exactly one correct answer in options
-                    correct_options = [o for o in mcq.options if o.is_correct]
-                    if not correct_options:
-                        logger.warning(
-                            "MCQ validation: No correct answer, forcing first option",
-                            concept=concept["name"],
-                        )
-                        if mcq.options:
-                            mcq.options[0].is_correct = True
-                    elif len(correct_options) > 1:
-                        logger.warning(
-                            "MCQ validation: Multiple correct answers, keeping first",
-                            concept=concept["name"],
-                        )
-                        for opt in mcq.options:
-                            opt.is_correct = False
-                        correct_options[0].is_correct = True
-
-                    results.append(mcq)
-                except Exception as e:
+                mcq.concept_id = concept.get("id", "")
+
+                # VALIDATION: Ensure exactly one correct answer in options
+                correct_options = [o for o in mcq.options if o.is_correct]
+                if not correct_options:
                     logger.warning(
-                        "ContentGenerator: Failed to generate MCQ for concept",
+                        "MCQ validation: No correct answer, forcing first option",
                         concept=concept["name"],
-                        error=str(e),
                     )
-            return results
-
-        # Run all concept MCQ generations in parallel
-        tasks = [_generate_one(concept) for concept in concepts]
+                    if mcq.options:
+                        mcq.options[0].is_correct = True
+                elif len(correct_options) > 1:
+                    logger.warning(
+                        "MCQ validation: Multiple correct answers, keeping first",
+                        concept=concept["name"],
+                    )
+                    for opt in mcq.options:
+                        opt.is_correct = False
+                    correct_options[0].is_correct = True
+
+                return mcq
+            except Exception as e:
+                logger.warning(
+                    "ContentGenerator: Failed to generate MCQ for concept",
+                    concept=concept["name"],
+                    error=str(e),
+                )
+                return None
+
+        # Run every MCQ generation in parallel, not just one chain per concept
+        tasks = [
+            _generate_one(concept)
+            for concept in concepts
+            for _ in range(num_per_concept)
+        ]
         batch_results = await asyncio.gather(*tasks, return_exceptions=True)
 
         all_mcqs = []
         for result in batch_results:
-            if isinstance(result, list):
-                all_mcqs.extend(result)
+            if isinstance(result, MCQQuestion):
+                all_mcqs.append(result)
             elif isinstance(result, Exception):
                 logger.warning("MCQ batch: task failed", error=str(result))
 
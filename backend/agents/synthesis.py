@@ -1,6 +1,7 @@
 """Agent 2: Synthesis Agent - Detects conflicts and merges concepts."""
 
 import json
+import math
 import time
 from pathlib import Path
 from typing import Any, Optional
@@ -93,14 +94,21 @@ Output JSON:
         self,
         existing_concepts: list[dict],
     ) -> list[tuple[dict, list[float]]]:
-        """Batch-embed all existing concepts once (cached across new concepts)."""
+        """Batch-embed all existing concepts once (cached across new concepts).
+
+        Vectors come back unit-normalized, so each comparison against a new
+        concept is a plain dot product instead of recomputing both norms.
+        """
         texts = [
             f"{c.get('name', '')}: {c.get('definition', '')}"
             for c in existing_concepts
         ]
         # Use batch embed to avoid N sequential API calls
         vectors = await self.embeddings.aembed_documents(texts)
-        return list(zip(existing_concepts, vectors))
+        return [
+            (concept, self._unit_vector(vector))
+            for concept, vector in zip(existing_concepts, vectors)
+        ]
 
     async def _find_similar_concepts(
         self,
@@ -111,18 +119,19 @@ Output JSON:
         Find existing concepts similar to the new concept.
 
         Uses cosine similarity between embeddings to find matches.
-        Expects pre-computed existing embeddings from _embed_existing_concepts.
+        Expects pre-computed, unit-normalized existing embeddings from
+        _embed_existing_concepts.
         """
         if not existing_with_embeddings:
             return []
 
         # Get embedding for the new concept
         concept_text = f"{concept.get('name', '')}: {concept.get('definition', '')}"
-        new_embedding = await self._get_embedding(concept_text)
+        new_unit = self._unit_vector(await self._get_embedding(concept_text))
 
         similar = []
-        for existing, existing_embedding in existing_with_embeddings:
-            similarity = self._cosine_similarity(new_embedding, existing_embedding)
+        for existing, existing_unit in existing_with_embeddings:
+            similarity = sum(a * b for a, b in zip(new_unit, existing_unit))
 
             if similarity > 0.3:  # Lower threshold for candidates
                 similar.append({
@@ -134,10 +143,16 @@ Output JSON:
         similar.sort(key=lambda x: x["similarity"], reverse=True)
         return similar[:5]
 
+    @staticmethod
+    def _unit_vector(vec: list[float]) -> list[float]:
+        """Scale a vector to unit length; a zero vector stays all zeros."""
+        norm = math.sqrt(sum(x * x for x in vec))
+        if norm == 0:
+            return [0.0] * len(vec)
+        return [x / norm for x in vec]
+
     def _cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
         """Calculate cosine similarity between two vectors."""
-        import math
-
         dot_product = sum(a * b for a, b in zip(vec1, vec2))
         norm1 = math.sqrt(sum(a * a for a in vec1))
         norm2 = math.sqrt(sum(b * b for b in vec2))
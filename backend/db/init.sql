@@ -138,6 +138,8 @@ CREATE TABLE IF NOT EXISTS quizzes (
     options_json JSONB,
     correct_answer TEXT NOT NULL,
     explanation TEXT,
+    embedding vector(768),  -- question embedding for semantic dedup
+    definition_embedding vector(768),  -- concept definition embedding for the MCQ semantic cache
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 
     CONSTRAINT valid_question_type CHECK (question_type IN ('mcq', 'open_ended', 'code')),
@@ -167,6 +169,8 @@ CREATE INDEX IF NOT EXISTS idx_proficiency_user_concept ON proficiency_scores(us
 CREATE INDEX IF NOT EXISTS idx_proficiency_next_review ON proficiency_scores(next_review_due);
 CREATE INDEX IF NOT EXISTS idx_flashcards_user_concept ON flashcards(user_id, concept_id);
 CREATE INDEX IF NOT EXISTS idx_quizzes_user_concept ON quizzes(user_id, concept_id);
+CREATE INDEX IF NOT EXISTS idx_quizzes_embedding ON quizzes USING hnsw (embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_quizzes_definition_embedding ON quizzes USING hnsw (definition_embedding vector_cosine_ops);
 CREATE INDEX IF NOT EXISTS idx_study_sessions_user ON study_sessions(user_id);
 
 -- Chat conversations table
@@ -0,0 +1,11 @@
+-- Migration 015: Store question embeddings on quizzes
+-- Semantic dedup used to re-embed the last 20 questions of a concept on every
+-- generated MCQ. Embeddings are now written at insert time (and lazily
+-- backfilled for older rows) so similarity is computed inside Postgres.
+-- 768 dims to match gemini-embedding-001 (see 014_fix_embedding_dimension.sql).
+
+ALTER TABLE quizzes ADD COLUMN IF NOT EXISTS embedding vector(768);
+
+-- HNSW needs no training data, so it is safe to build on a mostly-empty column
+CREATE INDEX IF NOT EXISTS idx_quizzes_embedding
+ON quizzes USING hnsw (embedding vector_cosine_ops);
@@ -0,0 +1,37 @@
+-- Migration 016: Per-user daily review rollup
+-- get_user_streak used to scan every study_sessions row of a user on each
+-- dashboard load. This table keeps one row per (user, day) and is maintained
+-- by a trigger, so the streak query only walks the days a user was active.
+
+CREATE TABLE IF NOT EXISTS user_daily_activity (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    activity_date DATE NOT NULL,
+    reviews INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, activity_date)
+);
+
+CREATE OR REPLACE FUNCTION bump_user_daily_activity() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO user_daily_activity (user_id, activity_date, reviews)
+    VALUES (NEW.user_id, DATE(NEW.reviewed_at), 1)
+    ON CONFLICT (user_id, activity_date)
+    DO UPDATE SET reviews = user_daily_activity.reviews + 1;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_study_sessions_daily_activity ON study_sessions;
+CREATE TRIGGER trg_study_sessions_daily_activity
+AFTER INSERT ON study_sessions
+FOR EACH ROW
+WHEN (NEW.reviewed_at IS NOT NULL)
+EXECUTE FUNCTION bump_user_daily_activity();
+
+-- Backfill from existing sessions (recomputed, so re-running is safe)
+INSERT INTO user_daily_activity (user_id, activity_date, reviews)
+SELECT user_id, DATE(reviewed_at), COUNT(*)
+FROM study_sessions
+WHERE reviewed_at IS NOT NULL
+GROUP BY user_id, DATE(reviewed_at)
+ON CONFLICT (user_id, activity_date)
+DO UPDATE SET reviews = EXCLUDED.reviews;
@@ -0,0 +1,6 @@
+-- Migration 017: Index for case-insensitive exact duplicate checks
+-- Lets FeedService._is_duplicate_question probe for an identical question
+-- instead of pulling recent questions and comparing them in Python.
+
+CREATE INDEX IF NOT EXISTS idx_quizzes_question_lower
+ON quizzes (user_id, concept_id, lower(question_text));
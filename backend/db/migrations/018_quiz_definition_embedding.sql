@@ -0,0 +1,9 @@
+-- Migration 018: Concept-definition embeddings on quizzes
+-- Generated MCQs record the embedding of the concept definition they were
+-- written for. Before calling the LLM, FeedService looks for a saved MCQ of
+-- the same user whose definition is near-identical and reuses it.
+
+ALTER TABLE quizzes ADD COLUMN IF NOT EXISTS definition_embedding vector(768);
+
+CREATE INDEX IF NOT EXISTS idx_quizzes_definition_embedding
+ON quizzes USING hnsw (definition_embedding vector_cosine_ops);
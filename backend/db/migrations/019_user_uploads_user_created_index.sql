@@ -0,0 +1,6 @@
+-- Migration 019: Index for sampling a user's recent uploads
+-- FeedService.get_user_uploads picks from a user's newest uploads instead of
+-- ORDER BY RANDOM() over all of them; this makes that window an index scan.
+
+CREATE INDEX IF NOT EXISTS idx_uploads_user_created
+ON user_uploads (user_id, created_at DESC);
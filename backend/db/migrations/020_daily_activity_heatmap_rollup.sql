@@ -0,0 +1,71 @@
+-- Migration 020: Heatmap columns on the daily review rollup
+-- get_daily_activity grouped 90 days of study_sessions on every dashboard
+-- load. The same trigger that feeds user_daily_activity now also tracks
+-- correct answers and distinct concepts per day, so the heatmap reads at most
+-- one rollup row per day instead of aggregating raw sessions.
+
+ALTER TABLE user_daily_activity
+ADD COLUMN IF NOT EXISTS correct INTEGER NOT NULL DEFAULT 0,
+ADD COLUMN IF NOT EXISTS concepts INTEGER NOT NULL DEFAULT 0;
+
+-- Concepts seen per day; lets the trigger count each concept once per day
+CREATE TABLE IF NOT EXISTS user_daily_concepts (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    activity_date DATE NOT NULL,
+    concept_id VARCHAR(255) NOT NULL,
+    PRIMARY KEY (user_id, activity_date, concept_id)
+);
+
+CREATE OR REPLACE FUNCTION bump_user_daily_activity() RETURNS TRIGGER AS $$
+DECLARE
+    new_concept INTEGER := 0;
+BEGIN
+    IF NEW.concept_id IS NOT NULL THEN
+        INSERT INTO user_daily_concepts (user_id, activity_date, concept_id)
+        VALUES (NEW.user_id, DATE(NEW.reviewed_at), NEW.concept_id)
+        ON CONFLICT DO NOTHING;
+        IF FOUND THEN
+            new_concept := 1;
+        END IF;
+    END IF;
+
+    INSERT INTO user_daily_activity (user_id, activity_date, reviews, correct, concepts)
+    VALUES (
+        NEW.user_id,
+        DATE(NEW.reviewed_at),
+        1,
+        CASE WHEN NEW.is_correct THEN 1 ELSE 0 END,
+        new_concept
+    )
+    ON CONFLICT (user_id, activity_date)
+    DO UPDATE SET
+        reviews = user_daily_activity.reviews + 1,
+        correct = user_daily_activity.correct + EXCLUDED.correct,
+        concepts = user_daily_activity.concepts + EXCLUDED.concepts;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill from existing sessions (recomputed, so re-running is safe)
+INSERT INTO user_daily_concepts (user_id, activity_date, concept_id)
+SELECT DISTINCT user_id, DATE(reviewed_at), concept_id
+FROM study_sessions
+WHERE reviewed_at IS NOT NULL
+  AND concept_id IS NOT NULL
+ON CONFLICT DO NOTHING;
+
+INSERT INTO user_daily_activity (user_id, activity_date, reviews, correct, concepts)
+SELECT
+    user_id,
+    DATE(reviewed_at),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE is_correct),
+    COUNT(DISTINCT concept_id)
+FROM study_sessions
+WHERE reviewed_at IS NOT NULL
+GROUP BY user_id, DATE(reviewed_at)
+ON CONFLICT (user_id, activity_date)
+DO UPDATE SET
+    reviews = EXCLUDED.reviews,
+    correct = EXCLUDED.correct,
+    concepts = EXCLUDED.concepts;
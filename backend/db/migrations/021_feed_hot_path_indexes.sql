@@ -0,0 +1,11 @@
+-- Migration 021: Indexes for the remaining feed hot-path filters
+-- The completed-today counts (feed metadata, stats, daily goal) filter
+-- study_sessions by user and reviewed_at, which only had a user_id index.
+-- _get_db_content counts and then offsets into a user's MCQs for one concept,
+-- filtering on question_type as well.
+
+CREATE INDEX IF NOT EXISTS idx_study_sessions_user_reviewed
+ON study_sessions (user_id, reviewed_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_quizzes_user_concept_type
+ON quizzes (user_id, concept_id, question_type);
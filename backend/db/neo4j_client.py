@@ -1,7 +1,7 @@
 """Neo4j database client with connection management."""
 
 import asyncio
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import structlog
 from neo4j import AsyncGraphDatabase, AsyncDriver
@@ -64,6 +64,8 @@ class Neo4jClient:
             # Indexes for common lookups
             "CREATE INDEX concept_name IF NOT EXISTS FOR (c:Concept) ON (c.name)",
             "CREATE INDEX concept_domain IF NOT EXISTS FOR (c:Concept) ON (c.domain)",
+            # Per-user concept scans (feed, mastery, domains) filter on user_id
+            "CREATE INDEX concept_user_id IF NOT EXISTS FOR (c:Concept) ON (c.user_id)",
             "CREATE INDEX note_source_note_id IF NOT EXISTS FOR (n:NoteSource) ON (n.note_id)",
         ]
 
@@ -133,6 +135,25 @@ class Neo4jClient:
             records = await result.data()
             return records
 
+    async def stream_query(
+        self,
+        query: str,
+        parameters: Optional[dict] = None,
+        database: str = "neo4j",
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Execute a Cypher query and yield records as they arrive.
+
+        Unlike ``execute_query`` the result set is never held in memory at
+        once, which matters for per-user scans over every concept.
+        """
+        if not self._driver:
+            raise RuntimeError("Neo4j driver not initialized")
+
+        async with self._driver.session(database=database) as session:
+            result = await session.run(query, parameters or {})
+            async for record in result:
+                yield record.data()
+
     async def execute_write(
         self,
         query: str,
@@ -2,11 +2,14 @@
 
 import asyncio
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import AsyncGenerator, Optional
 
+import orjson
 import structlog
 from pydantic_settings import BaseSettings
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -17,10 +20,33 @@ from sqlalchemy.ext.asyncio import (
 logger = structlog.get_logger()
 
 
+def _json_serializer(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+@lru_cache(maxsize=512)
+def _compiled_text(query: str) -> TextClause:
+    """Parse a raw SQL string into a TextClause once per distinct query."""
+    return text(query)
+
+
 class PostgresSettings(BaseSettings):
     """PostgreSQL connection settings."""
 
     database_url: str 
+    # asyncpg prepared-statement cache per connection. Must stay 0 behind
+    # pgbouncer in transaction mode (Supabase pooler); raise it for direct
+    # connections so hot feed queries skip parse/plan on every call.
+    pg_statement_cache_size: int = 0
+    # Prepared statements SQLAlchemy's asyncpg dialect keeps per connection,
+    # keyed by SQL string; size it to cover the app's distinct hot queries
+    pg_prepared_statement_cache_size: int = 100
+    # Shared connection pool; every PostgresClient call borrows from it
+    pg_pool_size: int = 10
+    pg_max_overflow: int = 20
+    # Per-statement timeout in seconds; off by default, since it would also
+    # cut off the long index builds and backfills run by initialize_schema
+    pg_command_timeout: Optional[float] = None
 
     model_config = {"env_prefix": "", "extra": "ignore"}
 
@@ -45,7 +71,10 @@ class PostgresClient:
             db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
         # Configure SSL for Cloud Databases (Supabase/Render)
-        connect_args = {"statement_cache_size": 0}
+        connect_args = {
+            "statement_cache_size": self.settings.pg_statement_cache_size,
+            "command_timeout": self.settings.pg_command_timeout,
+        }
         
         # Check if SSL is required (common in cloud deployments)
         is_cloud_db = "supabase" in db_url or "render" in db_url or "?sslmode=require" in db_url
@@ -58,14 +87,22 @@ class PostgresClient:
             ssl_ctx.verify_mode = ssl.CERT_NONE
             connect_args["ssl"] = ssl_ctx
             
+        # Each distinct SQL string is prepared once per connection and reused
+        engine_url = make_url(db_url).update_query_dict({
+            "prepared_statement_cache_size": str(self.settings.pg_prepared_statement_cache_size),
+        })
+
         self._engine = create_async_engine(
-            db_url,
-            pool_size=10,
-            max_overflow=20,
+            engine_url,
+            pool_size=self.settings.pg_pool_size,
+            max_overflow=self.settings.pg_max_overflow,
             pool_pre_ping=True,
             pool_recycle=3600,
             echo=False,
             connect_args=connect_args,
+            # JSON/JSONB values are (de)serialized by the driver codec; use orjson there
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
 
         self._session_factory = async_sessionmaker(
@@ -128,7 +165,7 @@ class PostgresClient:
     async def execute_query(self, query: str, params: Optional[dict] = None) -> list:
         """Execute a raw SQL query and return results."""
         async with self.session() as session:
-            result = await session.execute(text(query), params or {})
+            result = await session.execute(_compiled_text(query), params or {})
             # Guard against non-returning statements (UPDATE/INSERT without RETURNING)
             if result.returns_rows:
                 return [dict(row._mapping) for row in result.fetchall()]
@@ -137,7 +174,7 @@ class PostgresClient:
     async def execute_insert(self, query: str, params: Optional[dict] = None) -> Optional[str]:
         """Execute an insert query and return the inserted ID (if RETURNING clause present)."""
         async with self.session() as session:
-            result = await session.execute(text(query), params or {})
+            result = await session.execute(_compiled_text(query), params or {})
             # Only try fetchone if query has RETURNING clause — otherwise fetchone() throws
             # "This result object does not return rows"
             if result.returns_rows:
@@ -148,7 +185,18 @@ class PostgresClient:
     async def execute_update(self, query: str, params: Optional[dict] = None) -> None:
         """Execute an update/delete query without returning results."""
         async with self.session() as session:
-            await session.execute(text(query), params or {})
+            await session.execute(_compiled_text(query), params or {})
+
+    async def execute_many(self, query: str, params_list: list[dict]) -> None:
+        """Execute a statement for every parameter set in one executemany batch.
+
+        All rows share a single session/transaction, so either every row is
+        written or none are.
+        """
+        if not params_list:
+            return
+        async with self.session() as session:
+            await session.execute(_compiled_text(query), params_list)
 
 
 
@@ -250,6 +298,10 @@ async def get_postgres_client() -> PostgresClient:
     """Get or create the global PostgreSQL client instance."""
     global _postgres_client
 
+    # Fast path: the pool is created once and shared by every caller
+    if _postgres_client is not None:
+        return _postgres_client
+
     async with _client_lock:
         if _postgres_client is None:
             _postgres_client = PostgresClient()
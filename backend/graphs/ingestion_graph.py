@@ -202,7 +202,7 @@ from backend.agents.synthesis import SynthesisAgent
 from backend.agents.content_generator import ContentGeneratorAgent
 from backend.agents.proposition_agent import PropositionExtractionAgent
 from backend.services.ingestion import DocumentParserService, BookChunker
-from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.services.ingestion.embedding_service import EmbeddingService, to_vector_literal
 
 # Initialize agents
 extraction_agent = ExtractionAgent(temperature=0.2)
@@ -503,7 +503,7 @@ async def save_chunks_node(state: IngestionState) -> dict:
                     "created_at": now,
                 }
                 if embedding:
-                    row["embedding"] = "[" + ",".join(str(x) for x in embedding) + "]"
+                    row["embedding"] = to_vector_literal(embedding)
                     child_rows_with_embedding.append(row)
                 else:
                     missing_embedding_rows += 1
@@ -9,7 +9,7 @@ from typing import List, Optional
 from backend.auth.middleware import get_current_user
 from backend.db.postgres_client import get_postgres_client
 from backend.db.neo4j_client import get_neo4j_client
-from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.services.ingestion.embedding_service import EmbeddingService, to_vector_literal
 
 logger = structlog.get_logger()
 
@@ -416,7 +416,7 @@ async def backfill_embeddings(
         updated = 0
         for chunk_id, emb in zip(ids, embeddings):
             if emb:
-                embedding_literal = "[" + ",".join(str(x) for x in emb) + "]"
+                embedding_literal = to_vector_literal(emb)
                 await pg_client.execute_update(
                     """
                     UPDATE chunks SET embedding = cast(:emb as vector)
@@ -1,11 +1,11 @@
 """Feed Router - Active Recall Feed Endpoints."""
 
-import json
 import uuid
 import random
 import asyncio
 from typing import Optional
 
+import orjson
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
@@ -122,7 +122,7 @@ async def record_review(
         pg_client = await get_postgres_client()
         user_settings = (current_user.get("settings_json") or {})
         if isinstance(user_settings, str):
-            user_settings = json.loads(user_settings)
+            user_settings = orjson.loads(user_settings)
         algorithm = user_settings.get("sr_algorithm", "sm2")
         sr_service = SpacedRepetitionService(pg_client, algorithm=algorithm)
 
@@ -172,40 +172,50 @@ async def get_user_stats(
         
         user_id = str(current_user["id"])
         
-        # Get various stats
-        sr_stats = await sr_service.get_user_stats(user_id)
-        streak = await feed_service.get_user_streak(user_id)
-        completed_today = await feed_service.get_completed_today(user_id)
-        daily_goal = await feed_service.get_daily_goal(user_id)
-        domains = await feed_service.get_user_domains(user_id)
-        
-        # Get concept count from Neo4j
-        total_concepts = 0
-        try:
-            result = await neo4j_client.execute_query(
-                "MATCH (c:Concept {user_id: $user_id}) RETURN count(c) as count",
-                {"user_id": user_id},
-            )
-            if result:
-                total_concepts = result[0].get("count", 0)
-        except Exception as e:
-            logger.warning("Failed to get concept count", error=str(e))
-        
-        # Get note count
-        total_notes = 0
-        try:
-            result = await pg_client.execute_query(
-                "SELECT COUNT(*) as count FROM notes WHERE user_id = :user_id",
-                {"user_id": user_id},
-            )
-            if result:
-                total_notes = result[0].get("count", 0)
-        except Exception as e:
-            logger.warning("Failed to get note count", error=str(e))
-        
-        # Get domain mastery and daily activity
-        domain_progress = await feed_service.get_domain_mastery(user_id)
-        daily_activity = await feed_service.get_daily_activity(user_id)
+        async def count_concepts() -> int:
+            try:
+                result = await neo4j_client.execute_query(
+                    "MATCH (c:Concept {user_id: $user_id}) RETURN count(c) as count",
+                    {"user_id": user_id},
+                )
+                if result:
+                    return result[0].get("count", 0)
+            except Exception as e:
+                logger.warning("Failed to get concept count", error=str(e))
+            return 0
+
+        async def count_notes() -> int:
+            try:
+                result = await pg_client.execute_query(
+                    "SELECT COUNT(*) as count FROM notes WHERE user_id = :user_id",
+                    {"user_id": user_id},
+                )
+                if result:
+                    return result[0].get("count", 0)
+            except Exception as e:
+                logger.warning("Failed to get note count", error=str(e))
+            return 0
+
+        # The stats come from independent Postgres/Neo4j queries, so fetch them concurrently
+        (
+            sr_stats,
+            (streak, completed_today),
+            daily_goal,
+            domains,
+            total_concepts,
+            total_notes,
+            domain_progress,
+            daily_activity,
+        ) = await asyncio.gather(
+            sr_service.get_user_stats(user_id),
+            feed_service.get_streak_and_completed_today(user_id),
+            feed_service.get_daily_goal(user_id),
+            feed_service.get_user_domains(user_id),
+            count_concepts(),
+            count_notes(),
+            feed_service.get_domain_mastery(user_id),
+            feed_service.get_daily_activity(user_id),
+        )
         
         return UserStats(
             user_id=user_id,
@@ -284,7 +294,7 @@ async def get_saved_items(
         for q in saved_quizzes:
             opts = q.get("options_json")
             if isinstance(opts, str):
-                opts = json.loads(opts)
+                opts = orjson.loads(opts)
             items.append({
                 "id": q["id"],
                 "type": q.get("question_type", "mcq"),
@@ -554,10 +564,8 @@ async def generate_topic_quiz_stream(
     user_id = str(current_user["id"])
 
     async def event_stream():
-        import json as _json
-
         def sse(data: dict) -> str:
-            return f"data: {_json.dumps(data)}\n\n"
+            return f"data: {orjson.dumps(data).decode()}\n\n"
 
         try:
             pg_client = await get_postgres_client()
@@ -604,7 +612,7 @@ async def generate_topic_quiz_stream(
                 for q in existing:
                     opts = q.get("options_json")
                     if isinstance(opts, str):
-                        opts = _json.loads(opts)
+                        opts = orjson.loads(opts)
                     existing_questions.append({
                         "id": str(q["id"]),
                         "question": q["question_text"],
@@ -693,25 +701,21 @@ async def generate_topic_quiz_stream(
                         if itype in ["mcq", "fill_blank", "code_challenge"]:
                             try:
                                 await pg_client.execute_update(
-                                    """
-                                    INSERT INTO quizzes (id, user_id, concept_id, question_text, question_type,
-                                                        options_json, correct_answer, explanation, created_at, source,
-                                                        language, initial_code)
-                                    VALUES (:id, :uid, :cid, :q_text, :q_type, :opts, :correct, :exp, NOW(), 'batch_gen', :lang, :icode)
-                                    """,
+                                    FeedService._INSERT_BATCH_QUIZ_SQL,
                                     {
                                         "id": item_id,
                                         "uid": user_id,
                                         "cid": concept_id,
                                         "q_text": content.get("question") or content.get("instruction") or content.get("sentence"),
                                         "q_type": itype,
-                                        "opts": _json.dumps(content.get("options", [])),
+                                        "opts": orjson.dumps(content.get("options", [])).decode(),
                                         "correct": str(content.get("is_correct") or content.get("solution_code") or content.get("answers", [""])[0]),
                                         "exp": content.get("explanation", ""),
                                         "lang": content.get("language"),
                                         "icode": content.get("initial_code"),
                                     },
                                 )
+                                feed_service.record_generated(user_id)
                             except Exception as e:
                                 logger.warning("Quiz stream: save failed", error=str(e))
 
@@ -182,9 +182,7 @@ class ConceptReviewService:
             )
             
             if result:
-                import json
-                session_data = json.loads(result[0]["concepts_json"])
-                session = ConceptReviewSession(**session_data)
+                session = ConceptReviewSession.model_validate_json(result[0]["concepts_json"])
                 
                 # Check owner if provided
                 if user_id and session.user_id != user_id:
@@ -433,10 +431,8 @@ class ConceptReviewService:
                 {"user_id": user_id},
             )
             
-            import json
             for row in result:
-                session_data = json.loads(row["concepts_json"])
-                session = ConceptReviewSession(**session_data)
+                session = ConceptReviewSession.model_validate_json(row["concepts_json"])
                 # Add if not already in list
                 if not any(s.session_id == session.session_id for s in pending):
                     pending.append(session)
@@ -9,21 +9,26 @@ Combines:
 
 import random
 import asyncio
+import hashlib
+import heapq
 import uuid
-import time
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
+import orjson
 import structlog
-import json
 
 from backend.models.feed_schemas import (
     FeedItem,
     FeedItemType,
     FeedResponse,
     FeedFilterRequest,
+    MCQOption,
+    MCQQuestion,
 )
 from backend.services.spaced_repetition import SpacedRepetitionService
+from backend.services.ttl_cache import TTLCache
 
 from backend.agents.content_generator import ContentGeneratorAgent
 from backend.agents.web_quiz_agent import WebQuizAgent
@@ -32,6 +37,263 @@ from backend.config.llm import get_chat_model
 
 logger = structlog.get_logger()
 
+# Generated MCQs keyed by concept, difficulty, mastery bucket and prompt context.
+# Process-local (no Redis in this deployment); entries expire after a day.
+MCQ_CACHE_TTL_SECONDS = 24 * 60 * 60
+MCQ_CACHE_MAX_ENTRIES = 2048
+_mcq_cache: TTLCache[str, dict] = TTLCache(MCQ_CACHE_MAX_ENTRIES, MCQ_CACHE_TTL_SECONDS)
+
+# MCQ generations in flight, by the same key; concurrent feeds that miss the
+# cache on one key share a single LLM call instead of each paying for it
+_mcq_inflight: dict[str, asyncio.Future] = {}
+
+# Max cosine distance between concept definitions for reusing a saved MCQ. Closely
+# related concepts can fall inside it, so the saved MCQ's concept must also be the
+# same concept or share its name.
+MCQ_SEMANTIC_CACHE_MAX_DISTANCE = 0.15
+
+# Per-user count of today's 'batch_gen' quizzes: user_id -> (utc date, count).
+# Seeded from Postgres, bumped in-process on insert, and re-seeded once the entry
+# expires so inserts made by other workers are picked up.
+GENERATED_TODAY_RESEED_SECONDS = 300
+GENERATED_TODAY_MAX_ENTRIES = 10_000
+_generated_today: TTLCache[str, tuple[str, int]] = TTLCache(
+    GENERATED_TODAY_MAX_ENTRIES, GENERATED_TODAY_RESEED_SECONDS
+)
+
+# Cap on in-flight LLM generations across all feed requests in this process, so
+# bursts of concurrent feeds queue here instead of tripping provider rate limits
+LLM_MAX_CONCURRENCY = 8
+_llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+# Per-user concept domains for the feed's filter chips: user_id -> domains.
+# Domains only change on ingestion, so a short TTL is enough.
+DOMAINS_CACHE_TTL_SECONDS = 60
+DOMAINS_CACHE_MAX_ENTRIES = 10_000
+_domains_cache: TTLCache[str, list[str]] = TTLCache(
+    DOMAINS_CACHE_MAX_ENTRIES, DOMAINS_CACHE_TTL_SECONDS
+)
+
+# Per-user domain mastery for the stats dashboard: user_id -> mastery.
+# record_interaction drops the entry, since a review can move the scores.
+MASTERY_CACHE_TTL_SECONDS = 60
+MASTERY_CACHE_MAX_ENTRIES = 10_000
+_mastery_cache: TTLCache[str, dict[str, float]] = TTLCache(
+    MASTERY_CACHE_MAX_ENTRIES, MASTERY_CACHE_TTL_SECONDS
+)
+
+# Concept properties for due-item enrichment: (user_id, concept_id) -> concept.
+# Like domains, concept details only change on ingestion, so repeated feed loads
+# within the TTL skip Neo4j for concepts they have already seen.
+CONCEPT_CACHE_TTL_SECONDS = 60
+CONCEPT_CACHE_MAX_ENTRIES = 50_000
+_concept_cache: TTLCache[tuple[str, str], dict] = TTLCache(
+    CONCEPT_CACHE_MAX_ENTRIES, CONCEPT_CACHE_TTL_SECONDS
+)
+
+# Feed response metadata (SR stats, streak, completed today, domains) per user:
+# user_id -> future. Concurrent feed loads share one in-flight
+# lookup; record_interaction drops the entry so counts don't lag a review.
+FEED_META_TTL_SECONDS = 5
+FEED_META_MAX_ENTRIES = 10_000
+_feed_meta_cache: TTLCache[str, asyncio.Future] = TTLCache(
+    FEED_META_MAX_ENTRIES, FEED_META_TTL_SECONDS
+)
+
+# Dynamic cold-start MCQ per user, generated in the background after the first
+# cold-start feed and shown on the next ones
+COLD_START_DYNAMIC_MAX_ENTRIES = 1024
+_cold_start_dynamic: TTLCache[str, FeedItem] = TTLCache(COLD_START_DYNAMIC_MAX_ENTRIES)
+_cold_start_pending: set[str] = set()
+
+# MCQs for due concepts a feed didn't reach are generated in the background and
+# stored, so the next feed load serves them from the DB. The semaphore caps
+# prefetch generations process-wide; users with a prefetch running are skipped.
+PREFETCH_CONCURRENCY = 4
+PREFETCH_MAX_CONCEPTS = 5
+_prefetch_semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+_prefetch_pending: set[str] = set()
+
+# get_user_uploads samples from this many of a user's newest uploads
+UPLOADS_SAMPLE_POOL = 100
+
+# Longest streak get_user_streak will count; bounds the rows it reads
+STREAK_MAX_DAYS = 400
+
+# Midnight UTC of the current day; rebuilt by _utc_today_start when the date rolls over
+_today_start: Optional[datetime] = None
+
+
+def _utc_today_start() -> datetime:
+    """Timezone-aware start of the current UTC day, shared by the "today" counters."""
+    global _today_start
+    today = datetime.now(timezone.utc).date()
+    if _today_start is None or _today_start.date() != today:
+        _today_start = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
+    return _today_start
+
+
+# Strong references to fire-and-forget writes; the event loop only keeps weak ones
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn_background(coro, name: str) -> asyncio.Task:
+    """Run a coroutine off the request path, logging failures instead of raising."""
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+
+    def _done(t: asyncio.Task) -> None:
+        _background_tasks.discard(t)
+        if not t.cancelled() and t.exception() is not None:
+            logger.warning("FeedService: Background task failed", task=name, error=str(t.exception()))
+
+    task.add_done_callback(_done)
+    return task
+
+
+# Seed concept for the one LLM-generated item in a cold-start feed
+_COLD_START_CONCEPT = {
+    "id": "cold_start_dynamic",
+    "name": "Active Recall",
+    "definition": "A learning strategy where you actively retrieve information from memory, rather than passively reviewing material.",
+    "domain": "Meta-Learning",
+    "complexity_score": 3,
+    "priority_score": 0.6,
+}
+
+
+@lru_cache(maxsize=1)
+def _get_content_generator() -> ContentGeneratorAgent:
+    """Process-wide generator, so every feed request shares one LLM client."""
+    return ContentGeneratorAgent()
+
+
+@lru_cache(maxsize=1)
+def _get_web_quiz_agent() -> WebQuizAgent:
+    """Process-wide web quiz agent; keeps one search client alive across requests."""
+    return WebQuizAgent()
+
+
+# Onboarding items for brand-new users, validated once at import. Each cold-start
+# response copies them with a fresh id/timestamp (see _static_cold_start_items).
+_COLD_START_ITEMS: tuple[FeedItem, ...] = (
+    FeedItem(
+        item_type=FeedItemType.CONCEPT_SHOWCASE,
+        content={
+            "concept_name": "Welcome to GraphRecall",
+            "definition": "Your personal knowledge graph for active recall learning.",
+            "domain": "Meta-Learning",
+            "complexity_score": 1,
+            "tagline": "Build your second brain, one concept at a time.",
+            "visual_metaphor": "Think of GraphRecall as a mind map that quizzes you.",
+            "key_points": [
+                "Upload notes, PDFs, or images to extract concepts",
+                "Concepts are linked in a knowledge graph",
+                "Spaced repetition keeps knowledge fresh",
+            ],
+            "real_world_example": "Upload your lecture notes and get flashcards automatically.",
+            "connections_note": "",
+            "emoji_icon": "🧠",
+            "prerequisites": [],
+            "related_concepts": [],
+        },
+        concept_id="cold_start_welcome",
+        concept_name="Welcome to GraphRecall",
+        domain="Meta-Learning",
+        priority_score=1.0,
+    ),
+    FeedItem(
+        item_type=FeedItemType.TERM_CARD,
+        content={
+            "front": "What learning technique involves testing yourself on material rather than re-reading?",
+            "back": "Active Recall - retrieving information from memory strengthens long-term retention far more than passive review.",
+            "card_type": "basic",
+        },
+        concept_id="cold_start_active_recall",
+        concept_name="Active Recall",
+        domain="Meta-Learning",
+        priority_score=0.9,
+    ),
+    FeedItem(
+        item_type=FeedItemType.TERM_CARD,
+        content={
+            "front": "What is Spaced Repetition?",
+            "back": "A learning technique that reviews material at increasing intervals. Items you know well are shown less often; items you struggle with appear more frequently.",
+            "card_type": "basic",
+        },
+        concept_id="cold_start_spaced_rep",
+        concept_name="Spaced Repetition",
+        domain="Meta-Learning",
+        priority_score=0.8,
+    ),
+    FeedItem(
+        item_type=FeedItemType.TERM_CARD,
+        content={
+            "front": "How does a Knowledge Graph help learning?",
+            "back": "A Knowledge Graph connects concepts through relationships, showing prerequisites and related ideas. This mirrors how the brain organizes information -- through associations, not isolation.",
+            "card_type": "application",
+        },
+        concept_id="cold_start_kg",
+        concept_name="Knowledge Graphs",
+        domain="Meta-Learning",
+        priority_score=0.7,
+    ),
+)
+
+
+# Demo cards prepended to every feed, validated once at import. Each feed copies
+# them with a fresh id/timestamp (see _demo_items); the ids here are prefixes.
+_DEMO_ITEMS: tuple[FeedItem, ...] = (
+    FeedItem(
+        id="demo-transformer-mcq",
+        item_type=FeedItemType.MCQ,
+        concept_id="demo-transformer",
+        concept_name="Transformer Architecture",
+        domain="Gen AI",
+        priority_score=10.0,
+        content={
+            "question": "Which mechanism in the Transformer architecture allows it to weigh the importance of different words in a sequence simultaneously?",
+            "options": [
+                "Recurrent Neural Networks (RNNs)",
+                "Self-Attention Mechanism",
+                "Convolutional Layers",
+                "Long Short-Term Memory (LSTM)"
+            ],
+            "correct_answer": "Self-Attention Mechanism",
+            "explanation": "The self-attention mechanism is a core component of the Transformer model, allowing it to evaluate the importance of all words in a sequence relative to one another at the same time, overcoming the sequential processing limitations of RNNs."
+        }
+    ),
+    FeedItem(
+        id="demo-transformer-flashcard",
+        item_type=FeedItemType.TERM_CARD,
+        concept_id="demo-attention",
+        concept_name="Attention Mechanism",
+        domain="Gen AI",
+        priority_score=9.5,
+        content={
+            "front": "What role do Queries, Keys, and Values play in the Self-Attention mechanism?",
+            "back": "Queries determine what the current token is looking for, Keys represent what each token offers, and Values hold the actual information. The dot product of a Query and a Key determines the attention weight applied to the corresponding Value."
+        }
+    ),
+    FeedItem(
+        id="demo-transformer-showcase",
+        item_type=FeedItemType.CONCEPT_SHOWCASE,
+        concept_id="demo-transformer-2",
+        concept_name="Transformer Architecture",
+        domain="Gen AI",
+        priority_score=9.0,
+        content={
+            "title": "The Power of Transformers",
+            "description": "Transformers revolutionized NLP by abandoning recurrence entirely in favor of attention mechanisms, enabling massive parallelization during training and leading to LLMs like GPT-4.",
+            "key_points": [
+                "Introduced in 'Attention Is All You Need' (2017)",
+                "Eliminates sequential processing bottlenecks",
+                "Uses multi-head attention to capture different contextual relationships"
+            ]
+        }
+    ),
+)
+
 
 class FeedService:
     """Service for generating user's learning feed."""
@@ -40,10 +302,15 @@ class FeedService:
         self.pg_client = pg_client
         self.neo4j_client = neo4j_client
         self.sr_service = SpacedRepetitionService(pg_client)
-        self.content_generator = ContentGeneratorAgent()
-        self.web_quiz_agent = WebQuizAgent()
+        self.content_generator = _get_content_generator()
+        self.web_quiz_agent = _get_web_quiz_agent()
         self.llm_timeout_seconds = 8
         self._embedding_service = None  # Lazy init for dedup
+        # Normalized question text -> embedding, memoized for this service instance
+        self._question_embeddings: dict[str, list[float]] = {}
+        # Generated MCQs waiting for a bulk insert: (row params, cache key, content)
+        self._pending_quiz_rows: list[tuple[dict, Optional[str], dict]] = []
+        self._quiz_flush_lock = asyncio.Lock()
 
     async def _get_embedding_service(self):
         """Lazy-initialize embedding service for semantic dedup."""
@@ -52,20 +319,103 @@ class FeedService:
             self._embedding_service = EmbeddingService()
         return self._embedding_service
 
+    async def _call_llm(self, func, **kwargs):
+        """Run an LLM-backed call under the shared concurrency cap and timeout."""
+        async with _llm_semaphore:
+            return await asyncio.wait_for(func(**kwargs), timeout=self.llm_timeout_seconds)
+
+    @staticmethod
+    def _question_key(question_text: str) -> str:
+        return question_text.strip().lower()
+
+    async def _embed_questions(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed question texts, reusing embeddings already computed by this service.
+
+        Only texts not seen before hit the embedding API; failed embeddings come
+        back as empty lists and are not memoized.
+        """
+        missing: dict[str, str] = {}
+        for text in texts:
+            key = self._question_key(text)
+            if key not in self._question_embeddings:
+                missing.setdefault(key, text)
+
+        if missing:
+            emb_service = await self._get_embedding_service()
+            embeddings = await emb_service.embed_batch(list(missing.values()))
+            for key, emb in zip(missing, embeddings):
+                if emb:
+                    self._question_embeddings[key] = emb
+
+        return [self._question_embeddings.get(self._question_key(t), []) for t in texts]
+
+    @staticmethod
+    def _shingles(text: str, size: int = 3) -> set[str]:
+        """Character n-grams of the normalized question, for cheap fuzzy matching."""
+        normalized = " ".join(text.lower().split())
+        if len(normalized) <= size:
+            return {normalized}
+        return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+    @staticmethod
+    def _vector_literal(embedding: list[float]) -> str:
+        # float4 precision, as in embedding_service.to_vector_literal; kept local
+        # so importing the feed doesn't load the embedding client
+        return "[" + ",".join(format(x, ".9g") for x in embedding) + "]"
+
+    async def _backfill_question_embeddings(self, rows: list[dict]) -> None:
+        """Embed and store question embeddings for quizzes saved before the column existed."""
+        embeddings = await self._embed_questions([r["question_text"] for r in rows])
+        for row, emb in zip(rows, embeddings):
+            if not emb:
+                continue
+            await self.pg_client.execute_update(
+                "UPDATE quizzes SET embedding = cast(:embedding as vector) WHERE id = :id",
+                {"id": str(row["id"]), "embedding": self._vector_literal(emb)},
+            )
+
     async def _is_duplicate_question(
-        self, question_text: str, concept_id: str, user_id: str, threshold: float = 0.85
+        self,
+        question_text: str,
+        concept_id: str,
+        user_id: str,
+        threshold: float = 0.85,
+        fuzzy_threshold: float = 0.3,
     ) -> bool:
         """
         Check if a question is semantically similar to existing ones.
 
-        Uses embedding cosine similarity to catch paraphrased duplicates
-        that ILIKE matching would miss.
+        Runs exact -> fuzzy -> semantic. The fuzzy step compares character
+        3-gram overlap against recent questions and skips the embedding call
+        when nothing is even loosely similar. The semantic step uses embedding
+        cosine similarity to catch paraphrased duplicates that ILIKE matching
+        would miss; existing question embeddings live in quizzes.embedding, so
+        only the new question is embedded and pgvector finds the nearest
+        neighbour.
         """
         try:
-            # Quick text-based check first (cheap)
+            # Exact match check first (cheap, served by idx_quizzes_question_lower)
+            exact = await self.pg_client.execute_query(
+                """
+                SELECT 1 FROM quizzes
+                WHERE user_id = :user_id AND concept_id = :concept_id
+                  AND lower(question_text) = lower(:question_text)
+                LIMIT 1
+                """,
+                {
+                    "concept_id": concept_id,
+                    "user_id": user_id,
+                    "question_text": question_text.strip(),
+                },
+            )
+            if exact:
+                return True
+
             existing = await self.pg_client.execute_query(
                 """
-                SELECT question_text FROM quizzes
+                SELECT id, question_text, embedding IS NULL AS needs_embedding
+                FROM quizzes
                 WHERE concept_id = :concept_id AND user_id = :user_id
                 LIMIT 20
                 """,
@@ -74,102 +424,229 @@ class FeedService:
             if not existing:
                 return False
 
-            # Exact match check
-            existing_texts = [r["question_text"] for r in existing]
-            if question_text.strip().lower() in [t.strip().lower() for t in existing_texts]:
-                return True
+            # Fuzzy prefilter: only pay for an embedding if some question overlaps
+            query_shingles = self._shingles(question_text)
+            best_overlap = max(
+                len(query_shingles & other) / len(query_shingles | other)
+                for other in (self._shingles(r["question_text"]) for r in existing)
+            )
+            if best_overlap < fuzzy_threshold:
+                return False
 
             # Semantic similarity check via embeddings
-            emb_service = await self._get_embedding_service()
-            batch_texts = [question_text] + existing_texts
-            embeddings = await emb_service.embed_batch(batch_texts)
-            if len(embeddings) < 2:
+            query_emb = (await self._embed_questions([question_text]))[0]
+            if not query_emb:
                 return False
 
-            query_emb = embeddings[0]
-            for existing_emb in embeddings[1:]:
-                # Cosine similarity (embeddings are normalized by MRL)
-                dot_product = sum(a * b for a, b in zip(query_emb, existing_emb))
-                if dot_product > threshold:
-                    logger.info(
-                        "Semantic dedup: duplicate detected",
-                        similarity=round(dot_product, 3),
-                        concept_id=concept_id,
-                    )
-                    return True
+            missing = [r for r in existing if r.get("needs_embedding")]
+            if missing:
+                await self._backfill_question_embeddings(missing)
+
+            # Cosine similarity (embeddings are normalized by MRL)
+            nearest = await self.pg_client.execute_query(
+                """
+                SELECT 1 - (embedding <=> cast(:embedding as vector)) AS similarity
+                FROM quizzes
+                WHERE concept_id = :concept_id AND user_id = :user_id
+                  AND embedding IS NOT NULL
+                ORDER BY embedding <=> cast(:embedding as vector)
+                LIMIT 1
+                """,
+                {
+                    "concept_id": concept_id,
+                    "user_id": user_id,
+                    "embedding": self._vector_literal(query_emb),
+                },
+            )
+            if nearest and nearest[0]["similarity"] > threshold:
+                logger.info(
+                    "Semantic dedup: duplicate detected",
+                    similarity=round(nearest[0]["similarity"], 3),
+                    concept_id=concept_id,
+                )
+                return True
 
             return False
         except Exception as e:
             logger.warning("Semantic dedup check failed", error=str(e))
             return False  # Fail open — allow the question
 
-    async def _get_few_shot_examples(
+    async def _get_mastery_and_few_shots(
         self, concept_id: str, user_id: str, limit: int = 2
-    ) -> list[dict]:
+    ) -> tuple[float, list[dict]]:
         """
-        Fetch high-quality past MCQs as few-shot examples.
+        Fetch the user's mastery score (0.0-1.0) and few-shot MCQ examples in one query.
 
-        Retrieves liked/saved questions or recently correct ones to guide generation.
+        Examples prefer liked/saved questions, padded with the most recent ones
+        for the concept. The mastery score rides along on every row.
         """
         try:
             rows = await self.pg_client.execute_query(
                 """
-                SELECT question_text, options_json, explanation
-                FROM quizzes
-                WHERE user_id = :user_id
-                  AND concept_id = :concept_id
-                  AND (is_liked = true OR is_saved = true)
-                ORDER BY created_at DESC
-                LIMIT :limit
+                SELECT (
+                           SELECT score FROM proficiency_scores
+                           WHERE user_id = :user_id AND concept_id = :concept_id
+                           LIMIT 1
+                       ) AS mastery,
+                       q.question_text, q.options_json, q.explanation
+                FROM (SELECT 1) AS one
+                LEFT JOIN LATERAL (
+                    SELECT question_text, options_json, explanation
+                    FROM quizzes
+                    WHERE user_id = :user_id AND concept_id = :concept_id
+                    ORDER BY (coalesce(is_liked, false) OR coalesce(is_saved, false)) DESC,
+                             created_at DESC
+                    LIMIT :limit
+                ) q ON true
                 """,
                 {"user_id": user_id, "concept_id": concept_id, "limit": limit},
             )
-            if not rows:
-                # Fallback: any recent question for this concept
-                rows = await self.pg_client.execute_query(
-                    """
-                    SELECT question_text, options_json, explanation
+        except Exception as e:
+            logger.warning("FeedService: Error fetching mastery and few-shots", error=str(e))
+            return 0.0, []
+
+        if not rows:
+            return 0.0, []
+        mastery = float(rows[0].get("mastery") or 0.0)
+        examples = [e for e in map(self._few_shot_from_row, rows) if e]
+        return mastery, examples
+
+    async def _get_mastery_and_few_shots_bulk(
+        self, concept_ids: list[str], user_id: str, limit: int = 2
+    ) -> dict[str, tuple[float, list[dict]]]:
+        """``_get_mastery_and_few_shots`` for several concepts in one query.
+
+        Returns ``{concept_id: (mastery, examples)}``; on error it returns an
+        empty dict, so callers fall back to the per-concept lookup.
+        """
+        if not concept_ids:
+            return {}
+        try:
+            rows = await self.pg_client.execute_query(
+                """
+                SELECT c.concept_id,
+                       (
+                           SELECT score FROM proficiency_scores
+                           WHERE user_id = :user_id AND concept_id = c.concept_id
+                           LIMIT 1
+                       ) AS mastery,
+                       q.question_text, q.options_json, q.explanation
+                FROM unnest(CAST(:concept_ids AS text[])) AS c(concept_id)
+                LEFT JOIN LATERAL (
+                    SELECT question_text, options_json, explanation, created_at,
+                           (coalesce(is_liked, false) OR coalesce(is_saved, false)) AS favored
                     FROM quizzes
-                    WHERE user_id = :user_id AND concept_id = :concept_id
-                    ORDER BY created_at DESC
+                    WHERE user_id = :user_id AND concept_id = c.concept_id
+                    ORDER BY favored DESC, created_at DESC
                     LIMIT :limit
-                    """,
-                    {"user_id": user_id, "concept_id": concept_id, "limit": limit},
-                )
+                ) q ON true
+                ORDER BY c.concept_id, q.favored DESC, q.created_at DESC
+                """,
+                {"user_id": user_id, "concept_ids": list(concept_ids), "limit": limit},
+            )
+        except Exception as e:
+            logger.warning("FeedService: Error bulk fetching mastery and few-shots", error=str(e))
+            return {}
 
-            examples = []
-            for row in rows or []:
-                options = row.get("options_json")
-                if isinstance(options, str):
-                    try:
-                        options = json.loads(options)
-                    except Exception:
-                        continue
-                examples.append({
-                    "question": row["question_text"],
-                    "options": options or [],
-                    "explanation": row.get("explanation", ""),
-                })
-            return examples
-        except Exception:
-            return []
+        result: dict[str, tuple[float, list[dict]]] = {}
+        for row in rows:
+            concept_id = row["concept_id"]
+            if concept_id not in result:
+                result[concept_id] = (float(row.get("mastery") or 0.0), [])
+            example = self._few_shot_from_row(row)
+            if example:
+                result[concept_id][1].append(example)
+        return result
+
+    @staticmethod
+    def _few_shot_from_row(row: dict) -> Optional[dict]:
+        """A few-shot example from a quizzes row, or None for a mastery-only row."""
+        if row.get("question_text") is None:
+            return None  # no quizzes yet, only the mastery row
+        options = row.get("options_json")
+        if isinstance(options, str):
+            try:
+                options = orjson.loads(options)
+            except Exception:
+                return None
+        return {
+            "question": row["question_text"],
+            "options": options or [],
+            "explanation": row.get("explanation", ""),
+        }
 
-    async def _get_concept_mastery(self, concept_id: str, user_id: str) -> float:
-        """Get user's mastery score (0.0-1.0) for a concept."""
+    @staticmethod
+    def _mcq_cache_key(
+        concept_id: str, difficulty: int, mastery: float, few_shots: list[dict], context: str = ""
+    ) -> str:
+        mastery_bucket = min(int(mastery * 4), 3)  # quartiles of 0..1 mastery
+        prompt_context = orjson.dumps([few_shots, context], option=orjson.OPT_SORT_KEYS)
+        raw = f"{concept_id}|{difficulty}|{mastery_bucket}|".encode() + prompt_context
+        return hashlib.sha256(raw).hexdigest()
+
+    @staticmethod
+    def _get_cached_mcq(key: str) -> Optional[dict]:
+        content = _mcq_cache.get(key)
+        return dict(content) if content is not None else None
+
+    @staticmethod
+    def _cache_mcq(key: str, content: dict) -> None:
+        _mcq_cache.set(key, dict(content))
+
+    @staticmethod
+    async def _single_flight_mcq(key: str, generate) -> dict:
+        """Run ``generate`` for an MCQ cache key, or join the call already running."""
+        inflight = _mcq_inflight.get(key)
+        if inflight is not None:
+            content = await asyncio.shield(inflight)
+            if content is None:
+                raise RuntimeError("Shared MCQ generation failed")
+            return dict(content)
+
+        inflight = asyncio.get_running_loop().create_future()
+        _mcq_inflight[key] = inflight
+        content = None
         try:
-            rows = await self.pg_client.execute_query(
+            content = await generate()
+            return content
+        finally:
+            _mcq_inflight.pop(key, None)
+            # Joiners get None on failure and fall back on their own
+            inflight.set_result(content)
+
+    async def get_generated_today(self, user_id: str) -> int:
+        """Number of 'batch_gen' quizzes created for the user today (UTC)."""
+        today_start = _utc_today_start()
+        today = today_start.date().isoformat()
+        entry = _generated_today.get(user_id)
+        if entry and entry[0] == today:
+            return entry[1]
+
+        try:
+            result = await self.pg_client.execute_query(
                 """
-                SELECT score FROM proficiency_scores
-                WHERE user_id = :user_id AND concept_id = :concept_id
-                LIMIT 1
+                SELECT COUNT(*) as cnt 
+                FROM quizzes q
+                WHERE q.user_id = :uid AND q.created_at >= :today AND q.source = 'batch_gen'
                 """,
-                {"user_id": user_id, "concept_id": concept_id},
+                {"uid": user_id, "today": today_start},
             )
-            if rows:
-                return float(rows[0].get("score", 0.0))
-        except Exception:
-            pass
-        return 0.0
+            count = result[0]["cnt"] if result else 0
+        except Exception as e:
+            logger.warning("FeedService: Error counting generated quizzes", error=str(e))
+            return 0
+
+        _generated_today.set(user_id, (today, count))
+        return count
+
+    @staticmethod
+    def record_generated(user_id: str, count: int = 1) -> None:
+        """Bump today's generated-quiz counter after a 'batch_gen' quiz insert."""
+        today = _utc_today_start().date().isoformat()
+        entry = _generated_today.get(user_id)
+        if entry and entry[0] == today:
+            # Keeps the entry's expiry, so the count is still re-seeded on time
+            _generated_today.update(user_id, (today, entry[1] + count))
 
     def _basic_concept_showcase(self, concept: dict) -> dict:
         """Fallback concept showcase content without LLM calls."""
@@ -211,47 +688,84 @@ class FeedService:
     async def get_user_streak(self, user_id: str) -> int:
         """Get the user's current streak in days."""
         try:
-            # Calculate streak: consecutive days ending today or yesterday
+            # Calculate streak: consecutive days ending today or yesterday.
+            # user_daily_activity is kept up to date by a trigger on study_sessions;
+            # newest days first is a range scan on its (user_id, activity_date) key.
+            # The trigger dates rows with the database clock, so "today" comes
+            # from the same clock via CURRENT_DATE.
             result = await self.pg_client.execute_query(
                 """
-                WITH daily_activity AS (
-                    SELECT DISTINCT DATE(reviewed_at) as activity_date
-                    FROM study_sessions
-                    WHERE user_id = :user_id
-                    ORDER BY activity_date ASC
-                ),
-                groups AS (
-                    SELECT activity_date,
-                           activity_date - (ROW_NUMBER() OVER (ORDER BY activity_date ASC) * INTERVAL '1 day') as grp
-                    FROM daily_activity
-                ),
-                streak_stats AS (
-                    SELECT COUNT(*) as streak_days, MAX(activity_date) as last_activity
-                    FROM groups
-                    GROUP BY grp
-                )
-                SELECT streak_days
-                FROM streak_stats
-                WHERE last_activity >= CURRENT_DATE - INTERVAL '1 day'
-                ORDER BY last_activity DESC
-                LIMIT 1
+                SELECT activity_date, CURRENT_DATE AS today
+                FROM user_daily_activity
+                WHERE user_id = :user_id
+                ORDER BY activity_date DESC
+                LIMIT :max_days
                 """,
-                {"user_id": user_id},
+                {"user_id": user_id, "max_days": STREAK_MAX_DAYS},
             )
-            
-            if result:
-                return result[0].get("streak_days", 0)
-            return 0
         except Exception as e:
             logger.warning("FeedService: Error getting streak", error=str(e))
             return 0
+        if not result:
+            return 0
+        return self._streak_from_dates(
+            [row["activity_date"] for row in result], result[0]["today"]
+        )
+
+    @staticmethod
+    def _streak_from_dates(dates: list, today: date) -> int:
+        """Count consecutive active days, newest first, ending today or yesterday.
+
+        ``today`` must come from the clock that dated the activity rows.
+        """
+        streak = 0
+        expected = None
+        for day in dates:
+            if expected is None:
+                if (today - day).days > 1:
+                    return 0  # last activity was before yesterday
+            elif day != expected:
+                break
+            streak += 1
+            expected = day - timedelta(days=1)
+        return streak
+
+    async def get_streak_and_completed_today(self, user_id: str) -> tuple[int, int]:
+        """Streak and completed-today count in one round trip, for dashboards needing both."""
+        try:
+            result = await self.pg_client.execute_query(
+                """
+                SELECT
+                    (
+                        SELECT COUNT(*)
+                        FROM study_sessions
+                        WHERE user_id = :user_id
+                          AND reviewed_at >= :today_start
+                    ) AS completed,
+                    CURRENT_DATE AS today,
+                    ARRAY(
+                        SELECT activity_date
+                        FROM user_daily_activity
+                        WHERE user_id = :user_id
+                        ORDER BY activity_date DESC
+                        LIMIT :max_days
+                    ) AS dates
+                """,
+                {"user_id": user_id, "today_start": _utc_today_start(), "max_days": STREAK_MAX_DAYS},
+            )
+        except Exception as e:
+            logger.warning("FeedService: Error getting streak and completed count", error=str(e))
+            return 0, 0
+        if not result:
+            return 0, 0
+        row = result[0]
+        streak = self._streak_from_dates(row.get("dates") or [], row["today"])
+        return streak, row.get("completed") or 0
     
     async def get_completed_today(self, user_id: str) -> int:
         """Get number of items completed today."""
         try:
-            today_start = datetime.now(timezone.utc).replace(
-                hour=0, minute=0, second=0, microsecond=0
-            )
+            today_start = _utc_today_start()
             
             result = await self.pg_client.execute_query(
                 """
@@ -272,6 +786,10 @@ class FeedService:
     
     async def get_user_domains(self, user_id: str) -> list[str]:
         """Get all domains the user has concepts in."""
+        cached = _domains_cache.get(user_id)
+        if cached is not None:
+            return list(cached)
+
         try:
             # Get domains from Neo4j
             domains = await self.neo4j_client.execute_query(
@@ -282,91 +800,97 @@ class FeedService:
                 """,
                 {"user_id": user_id},
             )
-            return [d["domain"] for d in domains if d.get("domain")]
+            result = [d["domain"] for d in domains if d.get("domain")]
+            _domains_cache.set(user_id, result)
+            return list(result)
         except Exception as e:
             logger.warning("FeedService: Error getting domains", error=str(e))
             return []
 
     async def get_domain_mastery(self, user_id: str) -> dict[str, float]:
         """Calculate mastery percentage (0-100) for each domain."""
+        cached = _mastery_cache.get(user_id)
+        if cached is not None:
+            return dict(cached)
+
         try:
-            # 1. Get concept -> domain mapping from Neo4j
-            concepts_result = await self.neo4j_client.execute_query(
+            # 1. Get concept -> domain mapping from Neo4j, streamed straight
+            #    into the arrays sent to Postgres
+            concept_ids, domains = [], []
+            async for c in self.neo4j_client.stream_query(
                 """
                 MATCH (c:Concept {user_id: $user_id})
                 RETURN c.id as id, c.domain as domain
                 """,
                 {"user_id": user_id},
-            )
-            
-            domain_map = {c["id"]: c.get("domain", "General") for c in concepts_result}
-            
-            # 2. Get scores from Postgres
-            scores_result = await self.pg_client.execute_query(
-                """
-                SELECT concept_id, score 
-                FROM proficiency_scores 
-                WHERE user_id = :user_id
-                """,
-                {"user_id": user_id},
-            )
-            
-            score_map = {row["concept_id"]: row["score"] for row in scores_result}
-            
-            # 3. Aggregate
-            domain_totals = {}  # domain -> [total_score, count]
-            
-            for concept_id, domain in domain_map.items():
-                score = float(score_map.get(concept_id, 0.0))
-                if domain not in domain_totals:
-                    domain_totals[domain] = [0.0, 0]
-                
-                domain_totals[domain][0] += score
-                domain_totals[domain][1] += 1
-            
-            # 4. Calculate averages
+            ):
+                concept_ids.append(c["id"])
+                domains.append(c.get("domain") or "General")
+
+            # 2. Join with scores and average per domain in Postgres, so only
+            #    one row per domain comes back instead of one per concept
             mastery = {}
-            for domain, (total, count) in domain_totals.items():
-                if count > 0:
-                    mastery[domain] = round((total / count) * 100, 1)
-                else:
-                    mastery[domain] = 0.0
-                    
-            return mastery
+            if concept_ids:
+                result = await self.pg_client.execute_query(
+                    """
+                    SELECT d.domain, AVG(COALESCE(ps.score, 0)) AS avg_score
+                    FROM unnest(CAST(:concept_ids AS text[]), CAST(:domains AS text[]))
+                         AS d(concept_id, domain)
+                    LEFT JOIN proficiency_scores ps
+                      ON ps.user_id = :user_id AND ps.concept_id = d.concept_id
+                    GROUP BY d.domain
+                    """,
+                    {"user_id": user_id, "concept_ids": concept_ids, "domains": domains},
+                )
+                mastery = {
+                    row["domain"]: round(float(row["avg_score"] or 0) * 100, 1)
+                    for row in result
+                }
+
+            _mastery_cache.set(user_id, mastery)
+            return dict(mastery)
             
         except Exception as e:
             logger.error("FeedService: Error calculating domain mastery", error=str(e))
             return {}
 
     async def get_daily_activity(self, user_id: str, days: int = 90) -> list[dict]:
-        """Get daily activity stats for heatmap."""
+        """Get daily activity stats for heatmap.
+
+        Reads the per-day rollup kept by a trigger on study_sessions, and
+        Postgres builds the final JSON array, so the client decodes a single
+        value instead of shaping one dict per day.
+        """
         try:
             query = """
-            SELECT 
-                DATE(reviewed_at) as date,
-                COUNT(*) as reviews_completed,
-                COUNT(DISTINCT concept_id) as concepts_learned,
-                0 as notes_added, -- Placeholder, ideally join with notes table
-                AVG(CASE WHEN is_correct THEN 1 ELSE 0 END) as accuracy
-            FROM study_sessions
+            SELECT COALESCE(
+                json_agg(
+                    json_build_object(
+                        'date', to_char(activity_date, 'YYYY-MM-DD'),
+                        'reviews_completed', reviews,
+                        'concepts_learned', concepts,
+                        'notes_added', 0, -- Placeholder, ideally join with notes table
+                        'accuracy', COALESCE(correct::float / NULLIF(reviews, 0), 0)
+                    )
+                    ORDER BY activity_date DESC
+                ),
+                '[]'::json
+            ) AS activity
+            FROM user_daily_activity
             WHERE user_id = :user_id
-              AND reviewed_at >= CURRENT_DATE - INTERVAL '90 days'
-            GROUP BY DATE(reviewed_at)
-            ORDER BY date DESC
+              AND activity_date >= CURRENT_DATE - CAST(:days AS integer)
             """
             
-            result = await self.pg_client.execute_query(query, {"user_id": user_id})
-            
-            return [
-                {
-                    "date": row["date"].isoformat(),
-                    "reviews_completed": row["reviews_completed"],
-                    "concepts_learned": row["concepts_learned"],
-                    "notes_added": 0, # TODO: Separate query for notes if needed
-                    "accuracy": float(row["accuracy"] or 0),
-                }
-                for row in result
-            ]
+            result = await self.pg_client.execute_query(
+                query, {"user_id": user_id, "days": days}
+            )
+            if not result:
+                return []
+
+            activity = result[0].get("activity")
+            if isinstance(activity, str):
+                activity = orjson.loads(activity)
+            return activity or []
             
         except Exception as e:
             logger.error("FeedService: Error getting daily activity", error=str(e))
@@ -387,22 +911,33 @@ class FeedService:
                 
             # Extract all concept IDs
             concept_ids = [item["sm2_data"]["item_id"] for item in due_items]
-            
-            # Fetch all concepts from Neo4j in a single bulk query
+
+            # Serve recently seen concepts from the in-process cache
             concepts_map = {}
-            if concept_ids:
+            missing_ids = []
+            for concept_id in concept_ids:
+                cached = _concept_cache.get((user_id, concept_id))
+                if cached is not None:
+                    concepts_map[concept_id] = cached
+                else:
+                    missing_ids.append(concept_id)
+            
+            # Fetch the rest from Neo4j in a single bulk query; UNWIND gives
+            # one unique-index seek on Concept.id per due item
+            if missing_ids:
                 query = """
-                MATCH (c:Concept)
-                WHERE c.id IN $concept_ids AND c.user_id = $user_id
-                RETURN c
+                UNWIND $concept_ids AS concept_id
+                MATCH (c:Concept {id: concept_id, user_id: $user_id})
+                RETURN c {.*} AS c
                 """
                 results = await self.neo4j_client.execute_query(
                     query, 
-                    {"concept_ids": concept_ids, "user_id": user_id}
+                    {"concept_ids": missing_ids, "user_id": user_id}
                 )
                 for row in results:
                     c = row["c"]
                     concepts_map[c["id"]] = c
+                    _concept_cache.set((user_id, c["id"]), c)
             
             # Enrich with concept data
             enriched_concepts = []
@@ -429,18 +964,24 @@ class FeedService:
     ) -> list[dict]:
         """Get user's uploaded content (screenshots, infographics)."""
         try:
-            # Query for user uploads that haven't been shown recently
+            # Random pick among the user's newest uploads; bounding the window
+            # keeps the sort small however many uploads a user has
             result = await self.pg_client.execute_query(
                 """
-                SELECT 
-                    id, user_id, upload_type, file_url, thumbnail_url,
-                    title, description, linked_concepts, created_at
-                FROM user_uploads
-                WHERE user_id = :user_id
+                SELECT *
+                FROM (
+                    SELECT 
+                        id, user_id, upload_type, file_url, thumbnail_url,
+                        title, description, linked_concepts, created_at
+                    FROM user_uploads
+                    WHERE user_id = :user_id
+                    ORDER BY created_at DESC
+                    LIMIT :pool
+                ) recent
                 ORDER BY RANDOM()
                 LIMIT :limit
                 """,
-                {"user_id": user_id, "limit": limit},
+                {"user_id": user_id, "limit": limit, "pool": UPLOADS_SAMPLE_POOL},
             )
             return result
         except Exception as e:
@@ -465,22 +1006,16 @@ class FeedService:
             # Enrich with concept names in bulk (simplified)
             # ... (keep existing)
 
-            # Parse options_json (JSONB columns are auto-deserialized by the driver)
+            # Parse options_json. The driver already decodes JSONB; rows written
+            # with a pre-serialized string come back as str and need one more pass.
             for q in quizzes:
-                raw = q.get("options_json")
-                if raw:
-                    if isinstance(raw, list):
-                        # Already deserialized by JSONB driver
-                        q["options"] = raw
-                    elif isinstance(raw, str):
-                        try:
-                            q["options"] = json.loads(raw)
-                        except Exception:
-                            q["options"] = []
-                    else:
-                        q["options"] = []
-                else:
-                    q["options"] = []
+                options = q.get("options_json") or []
+                if isinstance(options, str):
+                    try:
+                        options = orjson.loads(options)
+                    except orjson.JSONDecodeError:
+                        options = []
+                q["options"] = options if isinstance(options, list) else []
             
             # Enrich with concept names from Neo4j in bulk? 
             # For now, we will return list. Frontend can maybe show "General" or we try to fetch names.
@@ -506,54 +1041,119 @@ class FeedService:
             
         try:
             if item_type == FeedItemType.MCQ:
-                # Get random MCQ for this concept
+                # Get random MCQ for this concept; a random offset skips the
+                # sort of every matching row that ORDER BY RANDOM() needs
                 result = await self.pg_client.execute_query(
                     """
-                    SELECT * FROM quizzes 
+                    SELECT id, question_text, options_json, explanation, source_url
+                    FROM quizzes
                     WHERE concept_id = :concept_id 
                       AND user_id = :user_id
                       AND question_type = 'mcq'
-                    ORDER BY RANDOM() LIMIT 1
+                    LIMIT 1
+                    OFFSET CAST(floor(random() * (
+                        SELECT COUNT(*)
+                        FROM quizzes
+                        WHERE concept_id = :concept_id
+                          AND user_id = :user_id
+                          AND question_type = 'mcq'
+                    )) AS bigint)
                     """,
                     {"concept_id": concept_id, "user_id": user_id}
                 )
                 if result:
-                    row = result[0]
-                    options = json.loads(row["options_json"]) if isinstance(row["options_json"], str) else row["options_json"]
-                    return {
-                        "question": row["question_text"],
-                        "options": options,
-                        "explanation": row["explanation"],
-                        "id": str(row["id"]),
-                        "source_url": row.get("source_url"),
-                    }
+                    return self._db_row_content(item_type, result[0])
 
             elif item_type == FeedItemType.TERM_CARD:
                  # Get random Flashcard
                 result = await self.pg_client.execute_query(
                     """
-                    SELECT * FROM flashcards
+                    SELECT id, front_content, back_content, source_url
+                    FROM flashcards
                     WHERE concept_id = :concept_id 
                       AND user_id = :user_id
-                    ORDER BY RANDOM() LIMIT 1
+                    LIMIT 1
+                    OFFSET CAST(floor(random() * (
+                        SELECT COUNT(*)
+                        FROM flashcards
+                        WHERE concept_id = :concept_id
+                          AND user_id = :user_id
+                    )) AS bigint)
                     """,
                     {"concept_id": concept_id, "user_id": user_id}
                 )
                 if result:
-                    row = result[0]
-                    return {
-                        "front": row["front_content"],
-                        "back": row["back_content"],
-                        "card_type": "basic", # Simplification
-                        "id": str(row["id"]),
-                        "source_url": row.get("source_url"),
-                    }
+                    return self._db_row_content(item_type, result[0])
                     
         except Exception as e:
             logger.warning("FeedService: DB lookup failed", error=str(e))
             
         return None
 
+    @staticmethod
+    def _db_row_content(item_type: FeedItemType, row: dict) -> dict:
+        """Shape a stored quiz or flashcard row into feed item content."""
+        if item_type == FeedItemType.MCQ:
+            options = orjson.loads(row["options_json"]) if isinstance(row["options_json"], str) else row["options_json"]
+            return {
+                "question": row["question_text"],
+                "options": options,
+                "explanation": row["explanation"],
+                "id": str(row["id"]),
+                "source_url": row.get("source_url"),
+            }
+        return {
+            "front": row["front_content"],
+            "back": row["back_content"],
+            "card_type": "basic", # Simplification
+            "id": str(row["id"]),
+            "source_url": row.get("source_url"),
+        }
+
+    async def _get_db_content_bulk(
+        self,
+        concept_ids: list[str],
+        item_type: FeedItemType,
+        user_id: str,
+    ) -> dict[str, dict]:
+        """One random stored item per concept, keyed by concept id, in one query.
+
+        Same content as ``_get_db_content`` for each concept; concepts with
+        nothing stored are absent from the result.
+        """
+        if not concept_ids:
+            return {}
+        if item_type == FeedItemType.MCQ:
+            query = """
+                SELECT DISTINCT ON (concept_id)
+                       concept_id, id, question_text, options_json, explanation, source_url
+                FROM quizzes
+                WHERE user_id = :user_id
+                  AND concept_id = ANY(:concept_ids)
+                  AND question_type = 'mcq'
+                ORDER BY concept_id, random()
+            """
+        elif item_type == FeedItemType.TERM_CARD:
+            query = """
+                SELECT DISTINCT ON (concept_id)
+                       concept_id, id, front_content, back_content, source_url
+                FROM flashcards
+                WHERE user_id = :user_id
+                  AND concept_id = ANY(:concept_ids)
+                ORDER BY concept_id, random()
+            """
+        else:
+            return {}
+
+        try:
+            result = await self.pg_client.execute_query(
+                query, {"user_id": user_id, "concept_ids": concept_ids}
+            )
+        except Exception as e:
+            logger.warning("FeedService: Bulk DB lookup failed", error=str(e))
+            return {}
+        return {row["concept_id"]: self._db_row_content(item_type, row) for row in result}
+
     async def _get_from_quiz_candidates(self, topic: str, user_id: str) -> Optional[dict]:
         """Try to fetch a pending quiz candidate for this topic."""
         try:
@@ -586,30 +1186,199 @@ class FeedService:
             logger.warning("FeedService: Error fetching quiz candidate", error=str(e))
             return None
 
+    # Skips a question the user already has for the concept, so racing
+    # generators don't store it twice (served by idx_quizzes_question_lower)
+    _INSERT_MCQ_SQL = """
+        INSERT INTO quizzes (id, user_id, concept_id, question_text, question_type, 
+                             options_json, correct_answer, explanation, embedding,
+                             definition_embedding, created_at)
+        SELECT :id, :user_id, :concept_id, :question_text, 'mcq',
+               :options_json, :correct_answer, :explanation,
+               cast(:embedding as vector), cast(:definition_embedding as vector), NOW()
+        WHERE NOT EXISTS (
+            SELECT 1 FROM quizzes
+            WHERE user_id = :user_id AND concept_id = :concept_id
+              AND lower(question_text) = lower(:question_text)
+        )
+    """
+
+    async def _embed_definition(self, concept: dict) -> list[float]:
+        """Embed a concept's definition and related concepts for the MCQ semantic cache."""
+        text = concept.get("definition", "")
+        if not text:
+            return []
+        related = concept.get("related_concepts") or []
+        if related:
+            text += "\nRelated: " + ", ".join(str(r) for r in related[:5])
+        try:
+            emb_service = await self._get_embedding_service()
+            return (await emb_service.embed_batch([text]))[0]
+        except Exception as e:
+            logger.warning("FeedService: Definition embedding failed", error=str(e))
+            return []
+
+    async def _find_similar_definition_mcq(
+        self, user_id: str, definition_embedding: list[float], concept: dict
+    ) -> Optional[MCQQuestion]:
+        """Return a saved MCQ of the same concept (or a same-named duplicate of it)
+        whose concept definition is near-identical."""
+        try:
+            rows = await self.pg_client.execute_query(
+                """
+                SELECT concept_id, question_text, options_json, explanation,
+                       definition_embedding <=> cast(:embedding as vector) AS distance
+                FROM quizzes
+                WHERE user_id = :user_id
+                  AND question_type = 'mcq'
+                  AND definition_embedding IS NOT NULL
+                ORDER BY definition_embedding <=> cast(:embedding as vector)
+                LIMIT 1
+                """,
+                {"user_id": user_id, "embedding": self._vector_literal(definition_embedding)},
+            )
+            if not rows or rows[0]["distance"] >= MCQ_SEMANTIC_CACHE_MAX_DISTANCE:
+                return None
+            row = rows[0]
+            if row["concept_id"] != concept.get("id"):
+                # A near-identical definition of a differently named concept is a
+                # related concept, not the same topic uploaded twice
+                names = await self.neo4j_client.execute_query(
+                    """
+                    MATCH (c:Concept {id: $concept_id, user_id: $user_id})
+                    RETURN c.name AS name
+                    """,
+                    {"concept_id": row["concept_id"], "user_id": user_id},
+                )
+                stored_name = names[0].get("name") if names else None
+                if not stored_name or (
+                    " ".join(stored_name.lower().split())
+                    != " ".join((concept.get("name") or "").lower().split())
+                ):
+                    return None
+            options = row["options_json"]
+            if isinstance(options, str):
+                options = orjson.loads(options)
+            return MCQQuestion(
+                concept_id=row["concept_id"],
+                question=row["question_text"],
+                options=[MCQOption(**o) for o in options],
+                explanation=row.get("explanation") or "",
+            )
+        except Exception as e:
+            logger.warning("FeedService: MCQ semantic cache lookup failed", error=str(e))
+            return None
+
+    @staticmethod
+    def _dump_mcq_options(mcq) -> tuple[list[dict], str]:
+        """Dump MCQ options and find the correct option id in a single pass."""
+        dumped, correct = [], None
+        for option in mcq.options:
+            dumped.append(option.model_dump())
+            if correct is None and option.is_correct:
+                correct = option.id
+        return dumped, correct or "A"
+
+    def _persist_mcq(
+        self,
+        q_id: str,
+        user_id: str,
+        concept_id: str,
+        mcq,
+        content: dict,
+        cache_key: Optional[str] = None,
+        definition_embedding: Optional[list[float]] = None,
+        correct_answer: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a generated MCQ for the next bulk insert (see _flush_pending_quizzes).
+
+        ``content["options"]`` must already hold the dumped options; pass the
+        ``correct_answer`` from ``_dump_mcq_options`` to avoid another scan.
+        """
+        if correct_answer is None:
+            correct_answer = next((o["id"] for o in content["options"] if o.get("is_correct")), "A")
+        # Reuse the embedding computed during dedup (None if it never ran)
+        q_emb = self._question_embeddings.get(self._question_key(mcq.question))
+        row = {
+            "id": q_id,
+            "user_id": user_id,
+            "concept_id": concept_id,
+            "question_text": mcq.question,
+            "options_json": orjson.dumps(content["options"]).decode(),
+            "correct_answer": correct_answer,
+            "explanation": mcq.explanation,
+            "embedding": self._vector_literal(q_emb) if q_emb else None,
+            "definition_embedding": (
+                self._vector_literal(definition_embedding) if definition_embedding else None
+            ),
+        }
+        self._pending_quiz_rows.append((row, cache_key, content))
+
+    async def _flush_pending_quizzes(self) -> None:
+        """Insert all queued MCQs in one executemany and cache them once stored."""
+        async with self._quiz_flush_lock:
+            pending, self._pending_quiz_rows = self._pending_quiz_rows, []
+            if not pending:
+                return
+            try:
+                await self.pg_client.execute_many(
+                    self._INSERT_MCQ_SQL, [row for row, _, _ in pending]
+                )
+            except Exception as e:
+                logger.warning("FeedService: Failed to save generated MCQs", count=len(pending), error=str(e))
+                return
+            for _, cache_key, content in pending:
+                if cache_key:
+                    self._cache_mcq(cache_key, content)
+
     async def generate_feed_item(
         self,
         user_id: str,
         concept: dict,
         item_type: FeedItemType,
         allow_llm: bool = True,
+        defer_save: bool = False,
+        preloaded_content: Optional[dict[str, dict]] = None,
+        preloaded_mcq_context: Optional[dict[str, tuple[float, list[dict]]]] = None,
     ) -> Optional[FeedItem]:
-        """Generate a feed item of the specified type for a concept."""
+        """
+        Generate a feed item of the specified type for a concept.
+
+        With ``defer_save`` generated MCQs are only queued; the caller is
+        responsible for calling ``_flush_pending_quizzes``. With ``allow_llm``
+        off, only persisted content is looked up; none of the LLM prep
+        (candidates, mastery, few-shots, embeddings) runs. ``preloaded_content``
+        is a ``_get_db_content_bulk`` result for ``item_type``; when given,
+        it replaces the per-concept DB lookup. Likewise a concept found in
+        ``preloaded_mcq_context`` (a ``_get_mastery_and_few_shots_bulk``
+        result) skips its own mastery/few-shot query.
+        """
+        concept_id = concept.get("id")
+        concept_name = concept.get("name")
+        domain = concept.get("domain")
         try:
+            definition = concept.get("definition", "")
+            related = concept.get("related_concepts", [])
+            difficulty = int(concept.get("complexity_score") or 5)
+            due_date = concept.get("sm2_data", {}).get("next_review")
             content = None
             
             # 1. Try fetching from DB first
-            if item_type in [FeedItemType.MCQ, FeedItemType.TERM_CARD] and concept.get("id"):
-                 content = await self._get_db_content(concept.get("id"), item_type, user_id)
+            if item_type in [FeedItemType.MCQ, FeedItemType.TERM_CARD] and concept_id:
+                if preloaded_content is not None:
+                    content = preloaded_content.get(concept_id)
+                else:
+                    content = await self._get_db_content(concept_id, item_type, user_id)
                  
             if content:
-                logger.info("FeedService: Using persisted content", item_type=item_type, concept_id=concept.get("id"))
+                logger.info("FeedService: Using persisted content", item_type=item_type, concept_id=concept_id)
                 feed_kwargs = {
                     "item_type": item_type,
                     "content": content,
-                    "concept_id": concept.get("id"),
-                    "concept_name": concept.get("name"),
-                    "domain": concept.get("domain"),
-                    "due_date": concept.get("sm2_data", {}).get("next_review"),
+                    "concept_id": concept_id,
+                    "concept_name": concept_name,
+                    "domain": domain,
+                    "due_date": due_date,
                     "priority_score": concept.get("priority_score", 1.0),
                 }
                 if isinstance(content, dict) and content.get("id"):
@@ -621,10 +1390,10 @@ class FeedService:
                 return FeedItem(
                     item_type=FeedItemType.CONCEPT_SHOWCASE,
                     content=fallback_content,
-                    concept_id=concept.get("id"),
-                    concept_name=concept.get("name"),
-                    domain=concept.get("domain"),
-                    due_date=concept.get("sm2_data", {}).get("next_review"),
+                    concept_id=concept_id,
+                    concept_name=concept_name,
+                    domain=domain,
+                    due_date=due_date,
                     priority_score=concept.get("priority_score", 0.6),
                 )
             
@@ -635,62 +1404,61 @@ class FeedService:
             if item_type == FeedItemType.MCQ and not content and ENABLE_WEB_SEARCH_FALLBACK:
                 try:
                     # Only search if we really lack content
-                    logger.info("FeedService: DB empty, trying Web Search", concept=concept.get("name"))
-                    web_mcqs, source_url = await asyncio.wait_for(
-                        self.web_quiz_agent.find_quizzes(
-                            concept_name=concept.get("name"),
-                            domain=concept.get("domain", "General"),
-                        ),
-                        timeout=self.llm_timeout_seconds,
+                    logger.info("FeedService: DB empty, trying Web Search", concept=concept_name)
+                    web_mcqs, source_url = await self._call_llm(
+                        self.web_quiz_agent.find_quizzes,
+                        concept_name=concept_name,
+                        domain=domain or "General",
                     )
                     
                     if web_mcqs:
-                         # Save ALL valid web MCQs to DB immediately
-                         pg_client = self.pg_client
-                         saved_count = 0
-                         first_saved_item = None
-                         
+                         # Save ALL valid web MCQs to DB in a single batch
+                         rows = []
+                         dumped_options = []
                          for mcq in web_mcqs:
-                             try:
-                                q_id = str(uuid.uuid4())
-                                await pg_client.execute_update(
-                                    """
-                                    INSERT INTO quizzes (id, user_id, concept_id, question_text, question_type, 
-                                                         options_json, correct_answer, explanation, created_at, source, source_url)
-                                    VALUES (:id, :user_id, :concept_id, :question_text, 'mcq',
-                                            :options_json, :correct_answer, :explanation, NOW(), 'web_search', :source_url)
-                                    """,
-                                    {
-                                        "id": q_id,
-                                        "user_id": user_id,
-                                        "concept_id": concept.get("id") or "unknown",
-                                        "question_text": mcq.question,
-                                        "options_json": json.dumps([o.model_dump() for o in mcq.options]),
-                                        "correct_answer": next((o.id for o in mcq.options if o.is_correct), "A"),
-                                        "explanation": mcq.explanation,
-                                        "source_url": source_url,
-                                    }
-                                )
-                                saved_count += 1
-                                if not first_saved_item:
-                                    first_saved_item = {
-                                        "question": mcq.question,
-                                        "options": [o.model_dump() for o in mcq.options],
-                                        "explanation": mcq.explanation,
-                                        "id": q_id,
-                                        "source_url": source_url,
-                                    }
-                             except Exception as e:
-                                 logger.warning("FeedService: Failed to save web MCQ", error=str(e))
+                             options, correct_answer = self._dump_mcq_options(mcq)
+                             dumped_options.append(options)
+                             rows.append({
+                                 "id": str(uuid.uuid4()),
+                                 "user_id": user_id,
+                                 "concept_id": concept_id or "unknown",
+                                 "question_text": mcq.question,
+                                 "options_json": orjson.dumps(options).decode(),
+                                 "correct_answer": correct_answer,
+                                 "explanation": mcq.explanation,
+                                 "source_url": source_url,
+                             })
+                         first_saved_item = None
+                         try:
+                             await self.pg_client.execute_many(
+                                 """
+                                 INSERT INTO quizzes (id, user_id, concept_id, question_text, question_type, 
+                                                      options_json, correct_answer, explanation, created_at, source, source_url)
+                                 VALUES (:id, :user_id, :concept_id, :question_text, 'mcq',
+                                         :options_json, :correct_answer, :explanation, NOW(), 'web_search', :source_url)
+                                 """,
+                                 rows,
+                             )
+                             saved_count = len(rows)
+                             first_mcq = web_mcqs[0]
+                             first_saved_item = {
+                                 "question": first_mcq.question,
+                                 "options": dumped_options[0],
+                                 "explanation": first_mcq.explanation,
+                                 "id": rows[0]["id"],
+                                 "source_url": source_url,
+                             }
+                         except Exception as e:
+                             logger.warning("FeedService: Failed to save web MCQs", error=str(e))
                                  
                          if first_saved_item:
                              logger.info("FeedService: Using Web content", items_found=saved_count)
                              feed_kwargs = {
                                 "item_type": item_type,
                                 "content": first_saved_item,
-                                "concept_id": concept.get("id"),
-                                "concept_name": concept.get("name"),
-                                "domain": concept.get("domain"),
+                                "concept_id": concept_id,
+                                "concept_name": concept_name,
+                                "domain": domain,
                                 "priority_score": concept.get("priority_score", 0.9), # Web content slightly lower than human/generated
                              }
                              if first_saved_item.get("id"):
@@ -703,110 +1471,119 @@ class FeedService:
             # 3. If no content, generate it
             content = {}
             if item_type == FeedItemType.CONCEPT_SHOWCASE:
-                content = await asyncio.wait_for(
-                    self.content_generator.generate_concept_showcase(
-                        concept_name=concept["name"],
-                        concept_definition=concept.get("definition", ""),
-                        domain=concept.get("domain", "General"),
-                        complexity_score=concept.get("complexity_score", 5),
-                        prerequisites=concept.get("prerequisites", []),
-                        related_concepts=concept.get("related_concepts", []),
-                    ),
-                    timeout=self.llm_timeout_seconds,
+                content = await self._call_llm(
+                    self.content_generator.generate_concept_showcase,
+                    concept_name=concept_name,
+                    concept_definition=definition,
+                    domain=domain or "General",
+                    complexity_score=concept.get("complexity_score", 5),
+                    prerequisites=concept.get("prerequisites", []),
+                    related_concepts=related,
                 )
                 
             elif item_type == FeedItemType.MCQ:
                 try:
-                    # Check for "Lazy Gen" candidates first
-                    candidate = await self._get_from_quiz_candidates(concept["name"], user_id)
+                    # Check for "Lazy Gen" candidates and fetch mastery + few-shot
+                    # examples for quality generation; the lookups are independent
+                    if preloaded_mcq_context and concept_id in preloaded_mcq_context:
+                        candidate = await self._get_from_quiz_candidates(concept_name, user_id)
+                        mastery, few_shots = preloaded_mcq_context[concept_id]
+                    else:
+                        candidate, (mastery, few_shots) = await asyncio.gather(
+                            self._get_from_quiz_candidates(concept_name, user_id),
+                            self._get_mastery_and_few_shots(concept_id or "", user_id),
+                        )
                     context_append = ""
                     if candidate:
-                        logger.info("FeedService: Using Lazy Quiz Candidate", concept=concept["name"])
+                        logger.info("FeedService: Using Lazy Quiz Candidate", concept=concept_name)
                         context_append = f"\n\nContext Source: {candidate['text']}"
 
-                    # Fetch mastery + few-shot examples for quality generation
-                    concept_id = concept.get("id", "")
-                    mastery = await self._get_concept_mastery(concept_id, user_id)
-                    few_shots = await self._get_few_shot_examples(concept_id, user_id)
-
-                    mcq = await asyncio.wait_for(
-                        self.content_generator.generate_mcq(
-                            concept_name=concept["name"],
-                            concept_definition=concept.get("definition", "") + context_append,
-                            related_concepts=concept.get("related_concepts", []),
-                            difficulty=int(concept.get("complexity_score", 5)),
-                            mastery_score=mastery,
-                            few_shot_examples=few_shots,
-                        ),
-                        timeout=self.llm_timeout_seconds,
+                    cache_key = self._mcq_cache_key(
+                        concept_id or "",
+                        difficulty,
+                        mastery,
+                        few_shots,
+                        context_append,
                     )
-
-                    # Semantic deduplication: skip if too similar to existing
-                    if concept_id:
-                        is_dup = await self._is_duplicate_question(
-                            mcq.question, concept_id, user_id
-                        )
-                        if is_dup:
-                            logger.info("FeedService: MCQ is duplicate, regenerating", concept=concept.get("name"))
-                            # One retry with higher temperature variation
-                            mcq = await asyncio.wait_for(
-                                self.content_generator.generate_mcq(
-                                    concept_name=concept["name"],
-                                    concept_definition=concept.get("definition", "") + context_append,
-                                    related_concepts=concept.get("related_concepts", []),
-                                    difficulty=int(concept.get("complexity_score", 5)),
+                    cached = self._get_cached_mcq(cache_key)
+                    if cached:
+                        # Already generated and saved for this concept/context
+                        logger.info("FeedService: Using cached MCQ", concept=concept_name)
+                        content = cached
+                    else:
+                        async def generate_mcq_content() -> dict:
+                            # Semantic cache: reuse a saved MCQ whose concept definition
+                            # is near-identical (e.g. the same topic uploaded twice)
+                            mcq = None
+                            definition_emb = await self._embed_definition(concept)
+                            if definition_emb and not context_append:
+                                mcq = await self._find_similar_definition_mcq(user_id, definition_emb, concept)
+                                if mcq:
+                                    logger.info("FeedService: Reusing MCQ of a similar concept", concept=concept_name)
+
+                            if mcq is None:
+                                mcq = await self._call_llm(
+                                    self.content_generator.generate_mcq,
+                                    concept_name=concept_name,
+                                    concept_definition=definition + context_append,
+                                    related_concepts=related,
+                                    difficulty=difficulty,
                                     mastery_score=mastery,
-                                ),
-                                timeout=self.llm_timeout_seconds,
-                            )
-
-                    content = {
-                        "question": mcq.question,
-                        "options": [o.model_dump() for o in mcq.options],
-                        "explanation": mcq.explanation,
-                    }
+                                    few_shot_examples=few_shots,
+                                )
+
+                                # Semantic deduplication: skip if too similar to existing
+                                if concept_id:
+                                    is_dup = await self._is_duplicate_question(
+                                        mcq.question, concept_id, user_id
+                                    )
+                                    if is_dup:
+                                        logger.info("FeedService: MCQ is duplicate, regenerating", concept=concept_name)
+                                        # One retry with higher temperature variation
+                                        mcq = await self._call_llm(
+                                            self.content_generator.generate_mcq,
+                                            concept_name=concept_name,
+                                            concept_definition=definition + context_append,
+                                            related_concepts=related,
+                                            difficulty=difficulty,
+                                            mastery_score=mastery,
+                                        )
+
+                            options, correct_answer = self._dump_mcq_options(mcq)
+                            content = {
+                                "question": mcq.question,
+                                "options": options,
+                                "explanation": mcq.explanation,
+                            }
                     
-                    # Save generated MCQ to DB for next time
-                    if concept.get("id"):
-                         try:
-                            q_id = str(uuid.uuid4())
-                            await self.pg_client.execute_update(
-                                """
-                                INSERT INTO quizzes (id, user_id, concept_id, question_text, question_type, 
-                                                     options_json, correct_answer, explanation, created_at)
-                                VALUES (:id, :user_id, :concept_id, :question_text, 'mcq',
-                                        :options_json, :correct_answer, :explanation, NOW())
-                                """,
-                                {
-                                    "id": q_id,
-                                    "user_id": user_id,
-                                    "concept_id": concept.get("id"),
-                                    "question_text": mcq.question,
-                                    "options_json": json.dumps(content["options"]),
-                                    "correct_answer": next((o.id for o in mcq.options if o.is_correct), "A"),
-                                    "explanation": mcq.explanation,
-                                }
-                            )
-                            content["id"] = q_id
-                         except Exception as e:
-                             logger.warning("FeedService: Failed to save generated MCQ", error=str(e))
+                            # Save generated MCQ to DB for next time, off the response path
+                            if concept_id:
+                                content["id"] = str(uuid.uuid4())
+                                self._persist_mcq(
+                                    content["id"], user_id, concept_id, mcq, content, cache_key,
+                                    definition_embedding=definition_emb,
+                                    correct_answer=correct_answer,
+                                )
+                                if not defer_save:
+                                    _spawn_background(self._flush_pending_quizzes(), name="persist_mcq")
+                            return content
+
+                        content = await self._single_flight_mcq(cache_key, generate_mcq_content)
                 except Exception as e:
                     logger.warning(
                         "FeedService: MCQ generation failed, using deterministic fallback",
-                        concept=concept.get("name"),
+                        concept=concept_name,
                         web_search_failed=web_search_failed,
                         error=str(e),
                     )
                     content = self._basic_mcq_fallback(concept)
                 
             elif item_type == FeedItemType.FILL_BLANK:
-                fill_blank = await asyncio.wait_for(
-                    self.content_generator.generate_fill_blank(
-                        concept_name=concept["name"],
-                        concept_definition=concept.get("definition", ""),
-                        difficulty=int(concept.get("complexity_score", 5)),
-                    ),
-                    timeout=self.llm_timeout_seconds,
+                fill_blank = await self._call_llm(
+                    self.content_generator.generate_fill_blank,
+                    concept_name=concept_name,
+                    concept_definition=definition,
+                    difficulty=difficulty,
                 )
                 content = {
                     "sentence": fill_blank.sentence,
@@ -815,14 +1592,12 @@ class FeedService:
                 }
                 
             elif item_type == FeedItemType.TERM_CARD:
-                flashcards = await asyncio.wait_for(
-                    self.content_generator.generate_flashcards(
-                        concept_name=concept["name"],
-                        concept_definition=concept.get("definition", ""),
-                        related_concepts=concept.get("related_concepts", []),
-                        num_cards=1,
-                    ),
-                    timeout=self.llm_timeout_seconds,
+                flashcards = await self._call_llm(
+                    self.content_generator.generate_flashcards,
+                    concept_name=concept_name,
+                    concept_definition=definition,
+                    related_concepts=related,
+                    num_cards=1,
                 )
                 if flashcards:
                     content = flashcards[0]
@@ -830,21 +1605,19 @@ class FeedService:
             elif item_type == FeedItemType.MERMAID_DIAGRAM:
                 # Generate a diagram for the concept
                 metadata = {}
-                if concept.get("related_concepts"):
-                    metadata["related"] = concept["related_concepts"]
+                if related:
+                    metadata["related"] = related
                 
                 # Create a mini-graph of concept + neighbors for the diagram
                 diagram_concepts = [concept]
                 # We would ideally fetch full objects for related concepts here
                 # For now using available data
                 
-                mermaid = await asyncio.wait_for(
-                    self.content_generator.generate_mermaid_diagram(
-                        concepts=diagram_concepts,
-                        diagram_type="mindmap", # Default to mindmap for single concept focus
-                        title=f"Map: {concept['name']}",
-                    ),
-                    timeout=self.llm_timeout_seconds,
+                mermaid = await self._call_llm(
+                    self.content_generator.generate_mermaid_diagram,
+                    concepts=diagram_concepts,
+                    diagram_type="mindmap", # Default to mindmap for single concept focus
+                    title=f"Map: {concept_name}",
                 )
                 content = {
                     "mermaid_code": mermaid.mermaid_code,
@@ -858,10 +1631,10 @@ class FeedService:
             feed_kwargs = {
                 "item_type": item_type,
                 "content": content,
-                "concept_id": concept.get("id"),
-                "concept_name": concept.get("name"),
-                "domain": concept.get("domain"),
-                "due_date": concept.get("sm2_data", {}).get("next_review"),
+                "concept_id": concept_id,
+                "concept_name": concept_name,
+                "domain": domain,
+                "due_date": due_date,
                 "priority_score": concept.get("priority_score", 1.0),
             }
             if isinstance(content, dict) and content.get("id"):
@@ -872,7 +1645,7 @@ class FeedService:
         except Exception as e:
             logger.warning(
                 "FeedService: LLM generation failed, using fallback card",
-                concept=concept.get("name"),
+                concept=concept_name,
                 item_type=item_type,
                 error=str(e),
             )
@@ -882,109 +1655,50 @@ class FeedService:
                 return FeedItem(
                     item_type=FeedItemType.CONCEPT_SHOWCASE,
                     content=self._basic_concept_showcase(concept),
-                    concept_id=concept.get("id"),
-                    concept_name=concept.get("name"),
-                    domain=concept.get("domain"),
+                    concept_id=concept_id,
+                    concept_name=concept_name,
+                    domain=domain,
                     priority_score=concept.get("priority_score", 0.5),
                 )
             except Exception as e:
-                logger.error("FeedService: Failed to generate feed item", concept_name=concept.get("name"), error=str(e), exc_info=True)
+                logger.error("FeedService: Failed to generate feed item", concept_name=concept_name, error=str(e), exc_info=True)
                 return None
     
+    @staticmethod
+    def _demo_items() -> list[FeedItem]:
+        """Demo cards for one feed response, each with its own id and timestamp."""
+        now = datetime.now(timezone.utc)
+        return [
+            item.model_copy(update={"id": f"{item.id}-{uuid.uuid4()}", "created_at": now})
+            for item in _DEMO_ITEMS
+        ]
+
     def _static_cold_start_items(self) -> list[FeedItem]:
         """Return pre-built onboarding items that require no LLM calls."""
+        now = datetime.now(timezone.utc)
         return [
-            FeedItem(
-                id=str(uuid.uuid4()),
-                item_type=FeedItemType.CONCEPT_SHOWCASE,
-                content={
-                    "concept_name": "Welcome to GraphRecall",
-                    "definition": "Your personal knowledge graph for active recall learning.",
-                    "domain": "Meta-Learning",
-                    "complexity_score": 1,
-                    "tagline": "Build your second brain, one concept at a time.",
-                    "visual_metaphor": "Think of GraphRecall as a mind map that quizzes you.",
-                    "key_points": [
-                        "Upload notes, PDFs, or images to extract concepts",
-                        "Concepts are linked in a knowledge graph",
-                        "Spaced repetition keeps knowledge fresh",
-                    ],
-                    "real_world_example": "Upload your lecture notes and get flashcards automatically.",
-                    "connections_note": "",
-                    "emoji_icon": "🧠",
-                    "prerequisites": [],
-                    "related_concepts": [],
-                },
-                concept_id="cold_start_welcome",
-                concept_name="Welcome to GraphRecall",
-                domain="Meta-Learning",
-                priority_score=1.0,
-            ),
-            FeedItem(
-                id=str(uuid.uuid4()),
-                item_type=FeedItemType.TERM_CARD,
-                content={
-                    "front": "What learning technique involves testing yourself on material rather than re-reading?",
-                    "back": "Active Recall - retrieving information from memory strengthens long-term retention far more than passive review.",
-                    "card_type": "basic",
-                },
-                concept_id="cold_start_active_recall",
-                concept_name="Active Recall",
-                domain="Meta-Learning",
-                priority_score=0.9,
-            ),
-            FeedItem(
-                id=str(uuid.uuid4()),
-                item_type=FeedItemType.TERM_CARD,
-                content={
-                    "front": "What is Spaced Repetition?",
-                    "back": "A learning technique that reviews material at increasing intervals. Items you know well are shown less often; items you struggle with appear more frequently.",
-                    "card_type": "basic",
-                },
-                concept_id="cold_start_spaced_rep",
-                concept_name="Spaced Repetition",
-                domain="Meta-Learning",
-                priority_score=0.8,
-            ),
-            FeedItem(
-                id=str(uuid.uuid4()),
-                item_type=FeedItemType.TERM_CARD,
-                content={
-                    "front": "How does a Knowledge Graph help learning?",
-                    "back": "A Knowledge Graph connects concepts through relationships, showing prerequisites and related ideas. This mirrors how the brain organizes information -- through associations, not isolation.",
-                    "card_type": "application",
-                },
-                concept_id="cold_start_kg",
-                concept_name="Knowledge Graphs",
-                domain="Meta-Learning",
-                priority_score=0.7,
-            ),
+            item.model_copy(update={"id": str(uuid.uuid4()), "created_at": now})
+            for item in _COLD_START_ITEMS
         ]
 
     async def generate_cold_start_feed(self, request: FeedFilterRequest) -> FeedResponse:
         """Generate a cold start feed for new users.
 
-        Uses static pre-built items as a fast fallback, then attempts to
-        generate one LLM-powered item. If the LLM fails, the static items
-        are returned immediately so the app never blocks on boot.
+        Returns the static pre-built items right away. One LLM-powered item
+        is generated in the background and included from the next cold-start
+        feed on, so the app never blocks on boot.
         """
         feed_items = self._static_cold_start_items()
 
-        # Attempt to generate one dynamic item, but don't block on failure
-        try:
-            concept = {
-                "id": "cold_start_dynamic",
-                "name": "Active Recall",
-                "definition": "A learning strategy where you actively retrieve information from memory, rather than passively reviewing material.",
-                "domain": "Meta-Learning",
-                "complexity_score": 3,
-                "priority_score": 0.6,
-            }
-            item = await self.generate_feed_item(request.user_id, concept, FeedItemType.MCQ)
-            if item:
-                feed_items.append(item)
-        except Exception as e:
-            logger.warning("FeedService: Cold start dynamic item failed, using static only", error=str(e))
+        dynamic = _cold_start_dynamic.get(request.user_id)
+        if dynamic:
+            feed_items.append(dynamic)
+        elif request.user_id not in _cold_start_pending:
+            _cold_start_pending.add(request.user_id)
+            _spawn_background(
+                self._precompute_cold_start_dynamic(request.user_id),
+                name="cold_start_dynamic",
+            )
 
         return FeedResponse(
             items=feed_items,
@@ -994,6 +1708,76 @@ class FeedService:
             domains=["Meta-Learning"],
         )
 
+    async def _get_feed_metadata(self, user_id: str) -> tuple[dict, int, int, list[str]]:
+        """SR stats, streak, completed-today count and domains for a feed response.
+
+        Served from a short-lived per-user cache; callers arriving while a
+        lookup is in flight await the same future.
+        """
+        future = _feed_meta_cache.get(user_id)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_feed_metadata(user_id))
+            _feed_meta_cache.set(user_id, future)
+        # Shielded so one cancelled feed request doesn't cancel the shared lookup
+        sr_stats, streak, completed_today, domains = await asyncio.shield(future)
+        return dict(sr_stats), streak, completed_today, list(domains)
+
+    async def _fetch_feed_metadata(self, user_id: str) -> tuple[dict, int, int, list[str]]:
+        # The lookups are independent, so run them concurrently
+        sr_stats, activity, domains = await asyncio.gather(
+            self.sr_service.get_user_stats(user_id),
+            self.get_streak_and_completed_today(user_id),
+            self.get_user_domains(user_id),
+            return_exceptions=True,
+        )
+        # Each lookup already logs and defaults on DB errors; mirror those defaults
+        if isinstance(sr_stats, Exception):
+            sr_stats = {}
+        streak, completed_today = (0, 0) if isinstance(activity, Exception) else activity
+        if isinstance(domains, Exception):
+            domains = []
+        return sr_stats, streak, completed_today, domains
+
+    async def _precompute_cold_start_dynamic(self, user_id: str) -> None:
+        """Generate the cold-start MCQ for a user and keep it for their next feed."""
+        try:
+            item = await self.generate_feed_item(user_id, _COLD_START_CONCEPT, FeedItemType.MCQ)
+            # A showcase here means generation fell back; let the next feed retry
+            if item and item.item_type == FeedItemType.MCQ:
+                _cold_start_dynamic.set(user_id, item)
+        except Exception as e:
+            logger.warning("FeedService: Cold start dynamic item failed, using static only", error=str(e))
+        finally:
+            _cold_start_pending.discard(user_id)
+
+    async def _prefetch_mcqs(self, user_id: str, concepts: list[dict]) -> None:
+        """Generate and store MCQs for concepts the next feed load will pick up."""
+
+        async def generate(concept: dict) -> None:
+            async with _prefetch_semaphore:
+                await self.generate_feed_item(
+                    user_id,
+                    concept,
+                    FeedItemType.MCQ,
+                    defer_save=True,
+                    preloaded_content={},
+                    preloaded_mcq_context=mcq_context,
+                )
+
+        try:
+            # Concepts that already have a stored MCQ need no generation
+            stored = await self._get_db_content_bulk(
+                [c["id"] for c in concepts], FeedItemType.MCQ, user_id
+            )
+            concepts = [c for c in concepts if c["id"] not in stored]
+            mcq_context = await self._get_mastery_and_few_shots_bulk(
+                [c["id"] for c in concepts], user_id
+            )
+            await asyncio.gather(*(generate(c) for c in concepts), return_exceptions=True)
+            await self._flush_pending_quizzes()
+        finally:
+            _prefetch_pending.discard(user_id)
+
     async def get_all_user_concepts(self, user_id: str, limit: int = 20) -> list[dict]:
         """Get ALL user concepts from Neo4j (not just spaced-rep due ones).
 
@@ -1004,23 +1788,29 @@ class FeedService:
             concepts = await self.neo4j_client.execute_query(
                 """
                 MATCH (c:Concept {user_id: $user_id})
-                OPTIONAL MATCH (c)-[:RELATED_TO]->(related:Concept {user_id: $user_id})
-                WITH c, collect(related.name)[0..5] as related_names
-                RETURN {
-                    id: c.id,
-                    name: c.name,
-                    definition: c.definition,
-                    domain: c.domain,
-                    complexity_score: c.complexity_score,
-                    confidence: coalesce(c["confidence"], 0.8),
-                    related_concepts: related_names
-                } AS concept
+                WITH c
                 ORDER BY c.created_at DESC
                 LIMIT $limit
+                // Expand neighbours only for the kept concepts, at most 5 each
+                CALL {
+                    WITH c
+                    OPTIONAL MATCH (c)-[:RELATED_TO]->(related:Concept {user_id: $user_id})
+                    WITH related LIMIT 5
+                    RETURN collect(related.name) AS related_names
+                }
+                RETURN c.id AS id,
+                       c.name AS name,
+                       c.definition AS definition,
+                       c.domain AS domain,
+                       c.complexity_score AS complexity_score,
+                       coalesce(c["confidence"], 0.8) AS confidence,
+                       related_names AS related_concepts
+                ORDER BY c.created_at DESC
                 """,
                 {"user_id": user_id, "limit": limit},
             )
-            return [c["concept"] for c in concepts]
+            # Rows already come back as flat dicts from result.data()
+            return concepts
         except Exception as e:
             logger.error("FeedService: Error getting all concepts", error=str(e))
             return []
@@ -1073,12 +1863,26 @@ class FeedService:
             ]
         
         # Determine content type distribution
-        allowed_types = request.item_types or list(FeedItemType)
+        allowed_types = frozenset(request.item_types or FeedItemType)
+
+        # Uploads don't depend on the generated items; fetch them while generation runs
+        uploads_task = None
+        if (
+            FeedItemType.SCREENSHOT in allowed_types or
+            FeedItemType.INFOGRAPHIC in allowed_types
+        ):
+            uploads_task = asyncio.create_task(
+                self.get_user_uploads(
+                    user_id=request.user_id,
+                    limit=min(3, request.max_items),
+                )
+            )
 
         # ---------------------------------------------------------------
         # PHASE 1: Serve cached content from DB first (instant, no LLM)
         # ---------------------------------------------------------------
         cached_items: list[FeedItem] = []
+        cached_quiz_concepts: set[str] = set()
         concept_ids_available = [c.get("id") for c in due_concepts if c.get("id")]
         
         # Build concept name lookup for annotation
@@ -1112,13 +1916,14 @@ class FeedService:
                     opts = q.get("options_json")
                     if isinstance(opts, str):
                         try:
-                            opts = json.loads(opts)
+                            opts = orjson.loads(opts)
                         except Exception:
                             opts = []
                     
                     q_type = q.get("question_type", "mcq")
                     cid = q.get("concept_id")
                     c_info = concept_map.get(cid, {})
+                    cached_quiz_concepts.add(cid)
                     
                     # Map the content fields differently depending on question type
                     if q_type == "code_challenge":
@@ -1201,45 +2006,59 @@ class FeedService:
         remaining_slots = max(0, request.max_items - len(feed_items))
         
         # Determine if we've hit the daily generation limit
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        generated_today = 0
-        try:
-            q_generated_res = await self.pg_client.execute_query(
-                """
-                SELECT COUNT(*) as cnt 
-                FROM quizzes q
-                WHERE q.user_id = :uid AND q.created_at >= :today AND q.source = 'batch_gen'
-                """,
-                {"uid": request.user_id, "today": today_start}
-            )
-            generated_today = q_generated_res[0]["cnt"] if q_generated_res else 0
-        except Exception:
-            pass
+        generated_today = await self.get_generated_today(request.user_id)
         generation_limit_reached = generated_today >= 20
 
-        if remaining_slots > 0 and not generation_limit_reached:
+        # Weighted pool of generated types (MCQ twice); the same for every concept
+        possible_types = tuple(
+            t for t in (
+                FeedItemType.CONCEPT_SHOWCASE,
+                FeedItemType.MCQ,
+                FeedItemType.FILL_BLANK,
+                FeedItemType.MCQ,
+                FeedItemType.TERM_CARD,
+                FeedItemType.MERMAID_DIAGRAM,
+            )
+            if t in allowed_types
+        )
+
+        candidates: list[dict] = []
+        if remaining_slots > 0 and not generation_limit_reached and possible_types:
             # Limit candidates to avoid too many parallel LLM calls
             candidates = due_concepts[:min(remaining_slots, 5)]
             tasks = []
+            today_iso = _utc_today_start().date().isoformat()
             
-            for concept in candidates:
-                possible_types = [
-                    t for t in [
-                        FeedItemType.CONCEPT_SHOWCASE,
-                        FeedItemType.MCQ,
-                        FeedItemType.FILL_BLANK,
-                        FeedItemType.MCQ,
-                        FeedItemType.TERM_CARD, 
-                        FeedItemType.MERMAID_DIAGRAM,
-                    ]
-                    if t in allowed_types
-                ]
-                
-                if not possible_types:
-                    continue
-                
-                item_type = random.choice(possible_types)
-                
+            # Seeded per user/concept/day so a concept keeps the same item type
+            # across feed loads, which keeps the MCQ caches' keys stable
+            planned = [
+                (
+                    concept,
+                    random.Random(f"{request.user_id}:{concept.get('id')}:{today_iso}").choice(possible_types),
+                )
+                for concept in candidates
+            ]
+
+            # Look up stored MCQs/flashcards for all candidates in one query per
+            # type, plus the MCQ prompt context in case generation is needed
+            stored_types = [FeedItemType.MCQ, FeedItemType.TERM_CARD]
+            *stored, mcq_context = await asyncio.gather(
+                *(
+                    self._get_db_content_bulk(
+                        [c["id"] for c, t in planned if t == stored_type and c.get("id")],
+                        stored_type,
+                        request.user_id,
+                    )
+                    for stored_type in stored_types
+                ),
+                self._get_mastery_and_few_shots_bulk(
+                    [c["id"] for c, t in planned if t == FeedItemType.MCQ and c.get("id")],
+                    request.user_id,
+                ),
+            )
+            preloaded = dict(zip(stored_types, stored))
+
+            for concept, item_type in planned:
                 tasks.append(
                     asyncio.create_task(
                         self.generate_feed_item(
@@ -1247,6 +2066,9 @@ class FeedService:
                             concept,
                             item_type,
                             allow_llm=True,
+                            defer_save=True,
+                            preloaded_content=preloaded.get(item_type),
+                            preloaded_mcq_context=mcq_context,
                         )
                     )
                 )
@@ -1254,30 +2076,56 @@ class FeedService:
             if tasks:
                 # Shorter timeout since we already have cached items to show
                 timeout = 4.0 if feed_items else 6.0
-                done, pending = await asyncio.wait(tasks, timeout=timeout)
-                
-                for task in done:
-                    try:
-                        res = await task
+                try:
+                    for next_done in asyncio.as_completed(tasks, timeout=timeout):
+                        try:
+                            res = await next_done
+                        except asyncio.TimeoutError:
+                            raise
+                        except Exception as e:
+                            logger.warning("FeedService: Task failed", error=str(e))
+                            continue
                         if res:
                             feed_items.append(res)
-                    except Exception as e:
-                        logger.warning("FeedService: Task failed", error=str(e))
+                        # Stop paying for generation once the feed is full
+                        if len(feed_items) >= request.max_items:
+                            break
+                except asyncio.TimeoutError:
+                    logger.info("FeedService: Generation timed out", timeout=timeout)
                 
-                for task in pending:
-                    task.cancel()
-        
-        # Add user uploads if allowed
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+
+                # Save every MCQ generated for this feed in one round trip
+                if self._pending_quiz_rows:
+                    _spawn_background(self._flush_pending_quizzes(), name="persist_mcqs")
+
+        # Warm the next feed load with MCQs for due concepts this one didn't reach
         if (
-            FeedItemType.SCREENSHOT in allowed_types or
-            FeedItemType.INFOGRAPHIC in allowed_types
+            not generation_limit_reached
+            and FeedItemType.MCQ in possible_types
+            and request.user_id not in _prefetch_pending
         ):
-            uploads = await self.get_user_uploads(
-                user_id=request.user_id,
-                limit=min(3, request.max_items - len(feed_items)),
-            )
+            prefetch = [
+                c for c in due_concepts[len(candidates):]
+                if c.get("id") and c["id"] not in cached_quiz_concepts
+            ][:PREFETCH_MAX_CONCEPTS]
+            if prefetch:
+                _prefetch_pending.add(request.user_id)
+                _spawn_background(
+                    self._prefetch_mcqs(request.user_id, prefetch),
+                    name="prefetch_mcqs",
+                )
+        
+        # Add user uploads if allowed, only into the slots generation left open.
+        # The task fetched the newest min(3, max_items); keep the newest of those
+        # that fit, the same rows a LIMIT on the remaining slots would return.
+        if uploads_task:
+            uploads = await uploads_task
+            open_slots = min(3, request.max_items - len(feed_items))
             
-            for upload in uploads:
+            for upload in uploads[:max(0, open_slots)]:
                 upload_type = FeedItemType(upload.get("upload_type", "screenshot"))
                 if upload_type in allowed_types:
                     upload_content = {
@@ -1294,78 +2142,27 @@ class FeedService:
                         "concept_name": upload.get("title"),
                         "domain": None,
                         "priority_score": 0.5,  # Lower priority than due items
-                        "created_at": upload.get("created_at"),
                     }
                     if upload.get("id"):
                         feed_kwargs["id"] = str(upload.get("id"))
-                    feed_items.append(FeedItem(**feed_kwargs))
+                    if upload.get("created_at"):
+                        feed_kwargs["created_at"] = upload["created_at"]
+                    # Row values are already typed by the driver; skip re-validation
+                    feed_items.append(FeedItem.model_construct(**feed_kwargs))
         
-        # Sort by priority
-        feed_items.sort(key=lambda x: x.priority_score, reverse=True)
+        # Keep the highest-priority items; the demo cards take the first slots
+        top_items = heapq.nlargest(
+            max(0, request.max_items - len(_DEMO_ITEMS)),
+            feed_items,
+            key=lambda x: x.priority_score,
+        )
 
         # Inject Demo Transformer Cards at the very top of the feed for demonstration purposes
-        demo_items = [
-            FeedItem(
-                id=f"demo-transformer-mcq-{uuid.uuid4()}",
-                item_type=FeedItemType.MCQ,
-                concept_id="demo-transformer",
-                concept_name="Transformer Architecture",
-                domain="Gen AI",
-                priority_score=10.0,
-                content={
-                    "question": "Which mechanism in the Transformer architecture allows it to weigh the importance of different words in a sequence simultaneously?",
-                    "options": [
-                        "Recurrent Neural Networks (RNNs)",
-                        "Self-Attention Mechanism",
-                        "Convolutional Layers",
-                        "Long Short-Term Memory (LSTM)"
-                    ],
-                    "correct_answer": "Self-Attention Mechanism",
-                    "explanation": "The self-attention mechanism is a core component of the Transformer model, allowing it to evaluate the importance of all words in a sequence relative to one another at the same time, overcoming the sequential processing limitations of RNNs."
-                },
-                created_at=datetime.utcnow()
-            ),
-            FeedItem(
-                id=f"demo-transformer-flashcard-{uuid.uuid4()}",
-                item_type=FeedItemType.TERM_CARD,
-                concept_id="demo-attention",
-                concept_name="Attention Mechanism",
-                domain="Gen AI",
-                priority_score=9.5,
-                content={
-                    "front": "What role do Queries, Keys, and Values play in the Self-Attention mechanism?",
-                    "back": "Queries determine what the current token is looking for, Keys represent what each token offers, and Values hold the actual information. The dot product of a Query and a Key determines the attention weight applied to the corresponding Value."
-                },
-                created_at=datetime.utcnow()
-            ),
-            FeedItem(
-                id=f"demo-transformer-showcase-{uuid.uuid4()}",
-                item_type=FeedItemType.CONCEPT_SHOWCASE,
-                concept_id="demo-transformer-2",
-                concept_name="Transformer Architecture",
-                domain="Gen AI",
-                priority_score=9.0,
-                content={
-                    "title": "The Power of Transformers",
-                    "description": "Transformers revolutionized NLP by abandoning recurrence entirely in favor of attention mechanisms, enabling massive parallelization during training and leading to LLMs like GPT-4.",
-                    "key_points": [
-                        "Introduced in 'Attention Is All You Need' (2017)",
-                        "Eliminates sequential processing bottlenecks",
-                        "Uses multi-head attention to capture different contextual relationships"
-                    ]
-                },
-                created_at=datetime.utcnow()
-            )
-        ]
-        
         # Prepend the demo items to the feed
-        feed_items = demo_items + feed_items
+        feed_items = [*self._demo_items(), *top_items]
         
         # Get metadata
-        sr_stats = await self.sr_service.get_user_stats(request.user_id)
-        streak = await self.get_user_streak(request.user_id)
-        completed_today = await self.get_completed_today(request.user_id)
-        domains = await self.get_user_domains(request.user_id)
+        sr_stats, streak, completed_today, domains = await self._get_feed_metadata(request.user_id)
         
         return FeedResponse(
             items=feed_items[:request.max_items],
@@ -1394,8 +2191,8 @@ class FeedService:
         - Analytics
         """
         try:
-            # Insert into study_sessions
-            await self.pg_client.execute_insert(
+            # Awaited so the caller only sees success once the row is stored
+            await self.pg_client.execute_update(
                 """
                 INSERT INTO study_sessions
                     (user_id, concept_id, item_type, interaction_type,
@@ -1403,7 +2200,6 @@ class FeedService:
                 VALUES
                     (:user_id, :concept_id, :item_type, :interaction_type,
                      :is_correct, :response_time_ms, NOW(), :session_type)
-                RETURNING id
                 """,
                 {
                     "user_id": user_id,
@@ -1416,6 +2212,9 @@ class FeedService:
                 },
             )
             
+            _feed_meta_cache.pop(user_id, None)
+            _mastery_cache.pop(user_id, None)
+
             logger.info(
                 "FeedService: Interaction recorded",
                 user_id=user_id,
@@ -1436,34 +2235,50 @@ class FeedService:
         Excludes items created Today if they are ad-hoc.
         """
         try:
-            # 1. Current Due (SR)
-            due_result = await self.sr_service.get_due_items(user_id)
-            current_due_count = len(due_result)
-            
-            # 2. Completed Today (Scheduled Only)
-            today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            completed_total = await self.get_completed_today(user_id)
-            
-            # Count ad-hoc completed (Created today)
-            adhoc_completed = 0
-            try:
-                # Check quizzes (approximation)
-                q_res = await self.pg_client.execute_query(
+            today_start = _utc_today_start()
+
+            # The lookups are independent; run them concurrently
+            due_result, session_counts, generated_today = await asyncio.gather(
+                # 1. Current Due (SR)
+                self.sr_service.get_due_items(user_id),
+                # 2. Completed today (all items) and the ad-hoc share of it,
+                #    in one statement. study_sessions doesn't record the quiz id,
+                #    so a quiz review counts as ad-hoc when its concept got a
+                #    batch_gen quiz today (approximation)
+                self.pg_client.execute_query(
                     """
-                    SELECT COUNT(*) as cnt 
+                    SELECT
+                        COUNT(*) AS completed,
+                        COUNT(*) FILTER (
+                            WHERE s.item_type = 'quiz'
+                              AND EXISTS (
+                                  SELECT 1 FROM quizzes q
+                                  WHERE q.user_id = s.user_id
+                                    AND q.concept_id = s.concept_id
+                                    AND q.created_at >= :today
+                                    AND q.source = 'batch_gen'
+                              )
+                        ) AS adhoc
                     FROM study_sessions s
-                    JOIN quizzes q ON (s.item_id = q.id AND s.item_type='quiz')
                     WHERE s.user_id = :uid 
                       AND s.reviewed_at >= :today
-                      AND q.created_at >= :today
-                      AND q.source = 'batch_gen'
                     """,
                     {"uid": user_id, "today": today_start}
-                )
-                if q_res: adhoc_completed += q_res[0]["cnt"]
-            except Exception:
-                pass
+                ),
+                # 3. Generated today, for the hard limit of 20 per day in the feed
+                self.get_generated_today(user_id),
+                return_exceptions=True,
+            )
+            if isinstance(due_result, BaseException):
+                raise due_result
+            current_due_count = len(due_result)
+
+            completed_total = adhoc_completed = 0
+            if isinstance(session_counts, BaseException):
+                logger.warning("FeedService: Error getting completed count", error=str(session_counts))
+            elif session_counts:
+                completed_total = session_counts[0]["completed"] or 0
+                adhoc_completed = session_counts[0]["adhoc"] or 0
 
             # Subtract ad-hoc from total completed
             completed_scheduled = max(0, completed_total - adhoc_completed)
@@ -1471,17 +2286,8 @@ class FeedService:
             # If current_due is 0, goal is completed_scheduled.
             total_goal = current_due_count + completed_scheduled
             
-            # Enforce hard limit of 20 maximum generated items per day in the feed
-            q_generated_res = await self.pg_client.execute_query(
-                """
-                SELECT COUNT(*) as cnt 
-                FROM quizzes q
-                WHERE q.user_id = :uid AND q.created_at >= :today AND q.source = 'batch_gen'
-                """,
-                {"uid": user_id, "today": today_start}
-            )
-            generated_today = q_generated_res[0]["cnt"] if q_generated_res else 0
-            
+            if isinstance(generated_today, BaseException):
+                generated_today = 0
             if generated_today >= 20:
                 logger.info("FeedService: Daily quiz generation limit (20) reached.", user_id=user_id, generated_today=generated_today)
                 
@@ -1504,12 +2310,20 @@ class FeedService:
             
             topic = res[0]["name"]
             
-            # Check existing item count (approximate by checking quizzes)
+            # Check existing item count (approximate by checking quizzes). Only
+            # "fewer than 20?" matters, so stop scanning at the 20th row.
             cnt_res = await self.pg_client.execute_query(
-                "SELECT count(*) as c FROM quizzes WHERE concept_id IN (SELECT concept_id FROM proficiency_scores WHERE user_id = :uid)",
+                """
+                SELECT 1 AS x FROM quizzes q
+                WHERE EXISTS (
+                    SELECT 1 FROM proficiency_scores p
+                    WHERE p.user_id = :uid AND p.concept_id = q.concept_id
+                )
+                LIMIT 20
+                """,
                 {"uid": user_id}
             )
-            count = cnt_res[0]["c"] if cnt_res else 0
+            count = len(cnt_res or [])
             
             if count < 20:
                 logger.info("Buffer: Low content, generating mixed batch", topic=topic, count=count)
@@ -1518,20 +2332,46 @@ class FeedService:
         except Exception as e:
             logger.warning("ensure_weekly_buffer error", error=str(e))
 
+    # Batch-generated content inserts. Kept as constants so every call sends the
+    # same SQL text and hits the driver's per-connection prepared-statement cache.
+    _INSERT_BATCH_QUIZ_SQL = """
+        INSERT INTO quizzes (id, user_id, concept_id, question_text, question_type, 
+                            options_json, correct_answer, explanation, created_at, source, 
+                            language, initial_code)
+        VALUES (:id, :uid, :cid, :q_text, :q_type, :opts, :correct, :exp, NOW(), 'batch_gen', :lang, :icode)
+    """
+    _INSERT_BATCH_FLASHCARD_SQL = """
+        INSERT INTO flashcards (id, user_id, concept_id, front_content, back_content, created_at, source)
+        VALUES (:id, :uid, :cid, :front, :back, NOW(), 'batch_gen')
+    """
+    _INSERT_BATCH_GENERATED_SQL = """
+        INSERT INTO generated_content (id, user_id, concept_id, content_type, content_json, created_at)
+        VALUES (:id, :uid, :cid, :ctype, :cjson, NOW())
+    """
+
     async def generate_content_batch(self, topic_name: str, user_id: str, target_size: int = 15, force_research: bool = False):
         """Generates a diversified batch of content (MCQs, Term Cards, Code, etc.) for a topic."""
         try:
             # Step 0: Resolve Topic to Concept ID
             concept_id = None
             concept_def = ""
+            related_names: list[str] = []
             try:
+                # Resolve the concept and its related names in one round trip
                 concept_res = await self.neo4j_client.execute_query(
-                    "MATCH (c:Concept {user_id: $user_id}) WHERE toLower(c.name) = toLower($name) RETURN c.id as id, c.definition as def LIMIT 1",
+                    """
+                    MATCH (c:Concept {user_id: $user_id})
+                    WHERE toLower(c.name) = toLower($name)
+                    WITH c LIMIT 1
+                    OPTIONAL MATCH (c)-[:RELATED_TO]-(r:Concept {user_id: $user_id})
+                    RETURN c.id as id, c.definition as def, collect(DISTINCT r.name)[..10] as related
+                    """,
                     {"name": topic_name, "user_id": user_id}
                 )
                 if concept_res:
                     concept_id = concept_res[0]["id"]
-                    concept_def = concept_res[0]["def"]
+                    concept_def = concept_res[0]["def"] or ""
+                    related_names = concept_res[0].get("related") or []
             except Exception:
                 pass
 
@@ -1546,76 +2386,71 @@ class FeedService:
             content_text = concept_def + "\n" + (research_result.get("summary") or "")
             
             # Use Mixed Generator
-            new_items = await self.content_generator.generate_mixed_batch(
-                topic=topic_name,
-                definition=content_text[:6000],
-                count=target_size
-            )
+            async with _llm_semaphore:
+                new_items = await self.content_generator.generate_mixed_batch(
+                    topic=topic_name,
+                    definition=content_text[:6000],
+                    related_concepts=related_names,
+                    count=target_size
+                )
             
-            saved_count = 0
+            # Group rows by destination table so each table gets one batched insert
+            quiz_rows, flash_rows, gc_rows = [], [], []
             for item in new_items:
                 itype = item.get("type")
                 content = item.get("content")
                 if not content: continue
 
+                item_id = str(uuid.uuid4())
+                if itype in ["mcq", "fill_blank", "code_challenge"]:
+                    quiz_rows.append({
+                        "id": item_id,
+                        "uid": user_id,
+                        "cid": concept_id,
+                        "q_text": content.get("question") or content.get("instruction") or content.get("sentence"),
+                        "q_type": itype,
+                        "opts": orjson.dumps(content.get("options", [])).decode(),
+                        "correct": str(content.get("is_correct") or content.get("solution_code") or content.get("answers", [""])[0]),
+                        "exp": content.get("explanation", ""),
+                        "lang": content.get("language"),
+                        "icode": content.get("initial_code")
+                    })
+                elif itype == "term_card":
+                    flash_rows.append({
+                        "id": item_id,
+                        "uid": user_id,
+                        "cid": concept_id,
+                        "front": content.get("front"),
+                        "back": content.get("back")
+                    })
+                else:
+                    gc_rows.append({
+                        "id": item_id,
+                        "uid": user_id,
+                        "cid": concept_id or "unknown",
+                        "ctype": "mermaid" if itype == "diagram" else itype,
+                        "cjson": orjson.dumps(content).decode()
+                    })
+
+            async def save(table: str, sql: str, rows: list[dict]) -> int:
+                if not rows:
+                    return 0
                 try:
-                    item_id = str(uuid.uuid4())
-                    
-                    if itype in ["mcq", "fill_blank", "code_challenge"]:
-                        # Save to quizzes table
-                        await self.pg_client.execute_update(
-                            """
-                            INSERT INTO quizzes (id, user_id, concept_id, question_text, question_type, 
-                                                options_json, correct_answer, explanation, created_at, source, 
-                                                language, initial_code)
-                            VALUES (:id, :uid, :cid, :q_text, :q_type, :opts, :correct, :exp, NOW(), 'batch_gen', :lang, :icode)
-                            """,
-                            {
-                                "id": item_id,
-                                "uid": user_id,
-                                "cid": concept_id,
-                                "q_text": content.get("question") or content.get("instruction") or content.get("sentence"),
-                                "q_type": itype,
-                                "opts": json.dumps(content.get("options", [])),
-                                "correct": str(content.get("is_correct") or content.get("solution_code") or content.get("answers", [""])[0]),
-                                "exp": content.get("explanation", ""),
-                                "lang": content.get("language"),
-                                "icode": content.get("initial_code")
-                            }
-                        )
-                    elif itype == "term_card":
-                        # Save to flashcards table
-                        await self.pg_client.execute_update(
-                            """
-                            INSERT INTO flashcards (id, user_id, concept_id, front_content, back_content, created_at, source)
-                            VALUES (:id, :uid, :cid, :front, :back, NOW(), 'batch_gen')
-                            """,
-                            {
-                                "id": item_id,
-                                "uid": user_id,
-                                "cid": concept_id,
-                                "front": content.get("front"),
-                                "back": content.get("back")
-                            }
-                        )
-                    else:
-                        # Save to generated_content table
-                        await self.pg_client.execute_update(
-                            """
-                            INSERT INTO generated_content (id, user_id, concept_id, content_type, content_json, created_at)
-                            VALUES (:id, :uid, :cid, :ctype, :cjson, NOW())
-                            """,
-                            {
-                                "id": item_id,
-                                "uid": user_id,
-                                "cid": concept_id or "unknown",
-                                "ctype": "mermaid" if itype == "diagram" else itype,
-                                "cjson": json.dumps(content)
-                            }
-                        )
-                    saved_count += 1
+                    await self.pg_client.execute_many(sql, rows)
                 except Exception as e:
-                    logger.warning("FeedService: Failed to save batch item", type=itype, error=str(e))
+                    logger.warning("FeedService: Failed to save batch items", table=table, count=len(rows), error=str(e))
+                    return 0
+                if table == "quizzes":
+                    self.record_generated(user_id, len(rows))
+                return len(rows)
+
+            # The tables are independent; each batch runs on its own pooled connection
+            saved = await asyncio.gather(
+                save("quizzes", self._INSERT_BATCH_QUIZ_SQL, quiz_rows),
+                save("flashcards", self._INSERT_BATCH_FLASHCARD_SQL, flash_rows),
+                save("generated_content", self._INSERT_BATCH_GENERATED_SQL, gc_rows),
+            )
+            saved_count = sum(saved)
             
             return {"status": "generated", "generated": saved_count}
             
@@ -1,3 +1,4 @@
+import bisect
 import re
 from typing import List, Optional
 from uuid import uuid4, UUID
@@ -5,6 +6,8 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter, MarkdownHea
 from .parser_service import ParsedDocument
 from ...models.schemas import ChunkCreate, ChunkLevel
 
+_PAGE_RE = re.compile(r"<!--\s*Page\s+(\d+)\s*-->")
+
 class HierarchicalChunker:
     """
     Splits documents into a Parent-Child hierarchy.
@@ -16,42 +19,50 @@ class HierarchicalChunker:
         self.parent_size = parent_size
         self.child_size = child_size
         self.overlap = overlap
+        # Built once so a chunker reused across documents doesn't rebuild them.
+        # add_start_index makes the splitters report each chunk's offset from a
+        # cursor that advances chunk by chunk, instead of re-searching the text.
+        self._parent_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=parent_size,
+            chunk_overlap=overlap,
+            add_start_index=True,
+        )
+        self._child_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=child_size,
+            chunk_overlap=overlap,
+            add_start_index=True,
+        )
 
     def _extract_page_markers(self, text: str) -> list[tuple[int, int]]:
+        # finditer yields matches in document order, so no sort is needed
         markers = [(0, 1)]
-        for match in re.finditer(r"<!--\s*Page\s+(\d+)\s*-->", text):
+        for match in _PAGE_RE.finditer(text):
             markers.append((match.start(), int(match.group(1))))
-        markers.sort(key=lambda x: x[0])
         return markers
 
-    def _find_page_for_offset(self, offset: Optional[int], markers: list[tuple[int, int]]) -> Optional[int]:
+    def _find_page_for_offset(
+        self, offset: Optional[int], positions: list[int], pages: list[int]
+    ) -> Optional[int]:
         if offset is None or offset < 0:
             return None
-        page = markers[0][1] if markers else 1
-        for pos, num in markers:
-            if pos <= offset:
-                page = num
-            else:
-                break
-        return page
+        if not pages:
+            return 1
+        i = bisect.bisect_right(positions, offset) - 1
+        return pages[i] if i >= 0 else pages[0]
 
     def chunk(self, document: ParsedDocument, note_id: UUID) -> List[ChunkCreate]:
         chunks = []
         
         # 1. Split into Parent Chunks first
         # Ideally use Markdown splitter if content looks structured
-        parent_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.parent_size,
-            chunk_overlap=self.overlap
-        )
-        
         doc_text = document.markdown_content
         page_markers = self._extract_page_markers(doc_text)
-        parent_texts = parent_splitter.split_text(doc_text)
-
-        search_start = 0
+        marker_positions = [pos for pos, _ in page_markers]
+        marker_pages = [num for _, num in page_markers]
+        parent_docs = self._parent_splitter.create_documents([doc_text])
         
-        for idx, parent_text in enumerate(parent_texts):
+        for idx, parent_doc in enumerate(parent_docs):
+            parent_text = parent_doc.page_content
             parent_id = uuid4()
             
             # Create Parent Chunk
@@ -94,40 +105,44 @@ class HierarchicalChunker:
             # Let's assume the Caller handles Saving. I will return a Structure:
             # { "parent": ChunkCreate, "children": [ChunkCreate] }
             
-            parent_offset = doc_text.find(parent_text, search_start)
+            # The splitter's cursor places repeated text at the occurrence being
+            # split; fall back to a search only if it couldn't place the chunk
+            parent_offset = parent_doc.metadata.get("start_index", -1)
             if parent_offset == -1:
                 parent_offset = doc_text.find(parent_text)
 
-            if parent_offset != -1:
-                search_start = parent_offset + len(parent_text)
-
-            parent_page_start = self._find_page_for_offset(parent_offset, page_markers)
+            parent_page_start = self._find_page_for_offset(
+                parent_offset, marker_positions, marker_pages
+            )
             parent_page_end = self._find_page_for_offset(
                 parent_offset + len(parent_text) - 1 if parent_offset != -1 else None,
-                page_markers,
+                marker_positions,
+                marker_pages,
             )
 
-            child_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=self.child_size,
-                chunk_overlap=self.overlap
-            )
-            child_texts = child_splitter.split_text(parent_text)
+            child_docs = self._child_splitter.create_documents([parent_text])
+            child_texts = [child_doc.page_content for child_doc in child_docs]
 
             child_page_starts: list[Optional[int]] = []
             child_page_ends: list[Optional[int]] = []
-            child_search_start = 0
 
-            for child_text in child_texts:
-                child_offset = parent_text.find(child_text, child_search_start)
+            for child_doc in child_docs:
+                child_text = child_doc.page_content
+                child_offset = child_doc.metadata.get("start_index", -1)
                 if child_offset == -1:
                     child_offset = parent_text.find(child_text)
                 if child_offset != -1 and parent_offset != -1:
-                    child_search_start = child_offset + len(child_text)
                     child_abs_offset = parent_offset + child_offset
-                    child_page_starts.append(self._find_page_for_offset(child_abs_offset, page_markers))
+                    child_page_starts.append(
+                        self._find_page_for_offset(
+                            child_abs_offset, marker_positions, marker_pages
+                        )
+                    )
                     child_page_ends.append(
                         self._find_page_for_offset(
-                            child_abs_offset + len(child_text) - 1, page_markers
+                            child_abs_offset + len(child_text) - 1,
+                            marker_positions,
+                            marker_pages,
                         )
                     )
                 else:
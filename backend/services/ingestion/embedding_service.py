@@ -1,12 +1,31 @@
 import asyncio
+import hashlib
 from typing import List
 import structlog
-from backend.config.llm import get_embeddings, get_embedding_dims
+from backend.config.llm import DEFAULT_EMBEDDING_MODEL, get_embeddings, get_embedding_dims
+from backend.services.ttl_cache import TTLCache
 
 logger = structlog.get_logger()
 
 MAX_RETRIES = 3
 MAX_BATCH_SIZE = 50
+MAX_CONCURRENT_BATCHES = 4
+
+# Document embeddings keyed by a hash of model, dims and text. Process-local (no
+# Redis in this deployment); re-ingesting an edited note only pays for the
+# chunks that changed. Each entry is a 768-float vector, so the cap stays small.
+# Vectors are stored as tuples so no caller can mutate a cached entry.
+EMBEDDING_CACHE_MAX_ENTRIES = 2048
+_embedding_cache: TTLCache[str, tuple[float, ...]] = TTLCache(EMBEDDING_CACHE_MAX_ENTRIES)
+
+
+def to_vector_literal(embedding: List[float]) -> str:
+    """Format an embedding as a pgvector literal for ``cast(:emb as vector)``.
+
+    pgvector stores float4, so 9 significant digits round-trip every stored
+    value exactly; Python's default repr sends ~17 and pads the payload.
+    """
+    return "[" + ",".join(format(x, ".9g") for x in embedding) + "]"
 
 
 class EmbeddingService:
@@ -44,10 +63,56 @@ class EmbeddingService:
                     await asyncio.sleep(wait)
         return []
 
+    def _cache_key(self, text: str) -> str:
+        return hashlib.sha256(
+            f"{DEFAULT_EMBEDDING_MODEL}:{self.dims}:{text}".encode()
+        ).hexdigest()
+
+    async def _embed_sub_batch(
+        self, batch: List[str], batch_start: int, semaphore: asyncio.Semaphore
+    ) -> List[List[float]]:
+        """Embed one sub-batch, falling back to one-by-one if the batch fails.
+
+        Every API call, including the fallback singles, takes a slot on
+        ``semaphore`` so the fallback can't exceed the batch concurrency.
+        """
+        async with semaphore:
+            batch_embeddings = await self._embed_with_retry(batch)
+        if batch_embeddings:
+            return batch_embeddings
+
+        # If full batch fails, try one-by-one as last resort
+        logger.warning(
+            "Batch embedding failed, falling back to individual embedding",
+            batch_start=batch_start,
+            batch_size=len(batch),
+        )
+
+        async def embed_single(text: str) -> List[List[float]]:
+            async with semaphore:
+                return await self._embed_with_retry([text])
+
+        singles = await asyncio.gather(*(embed_single(text) for text in batch))
+        embeddings: List[List[float]] = []
+        for j, (text, single) in enumerate(zip(batch, singles)):
+            if single:
+                embeddings.append(single[0])
+            else:
+                logger.error(
+                    "Individual embedding failed permanently",
+                    text_index=batch_start + j,
+                    text_preview=text[:80],
+                )
+                embeddings.append([])  # Placeholder - will be caught downstream
+        return embeddings
+
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Embed a batch of texts for storage (retrieval_document task).
 
-        Splits large batches and retries on failure.
+        Identical texts are embedded once, and texts embedded earlier in this
+        process are served from cache. Splits large batches, embeds up to
+        MAX_CONCURRENT_BATCHES of them concurrently, and retries on failure.
+        Output order matches input order.
         """
         if not self.embedder:
             logger.error("Embedding service not configured")
@@ -56,37 +121,42 @@ class EmbeddingService:
         if not texts:
             return []
 
-        # Split into smaller batches to avoid API limits
-        all_embeddings: List[List[float]] = []
-        for i in range(0, len(texts), MAX_BATCH_SIZE):
-            batch = texts[i:i + MAX_BATCH_SIZE]
-            batch_embeddings = await self._embed_with_retry(batch)
-
-            if not batch_embeddings:
-                # If full batch fails, try one-by-one as last resort
-                logger.warning(
-                    "Batch embedding failed, falling back to individual embedding",
-                    batch_start=i,
-                    batch_size=len(batch),
-                )
-                for j, text in enumerate(batch):
-                    single = await self._embed_with_retry([text])
-                    if single:
-                        all_embeddings.append(single[0])
-                    else:
-                        logger.error(
-                            "Individual embedding failed permanently",
-                            text_index=i + j,
-                            text_preview=text[:80],
-                        )
-                        all_embeddings.append([])  # Placeholder - will be caught downstream
-            else:
-                all_embeddings.extend(batch_embeddings)
+        # Repeated chunks (headers, boilerplate) only need one API call each
+        unique_positions: dict[str, int] = {}
+        order = [unique_positions.setdefault(text, len(unique_positions)) for text in texts]
+        unique_texts = list(unique_positions)
+
+        keys = [self._cache_key(text) for text in unique_texts]
+        unique_embeddings: List[List[float]] = [
+            list(_embedding_cache.get(key, ())) for key in keys
+        ]
+        missing = [i for i, embedding in enumerate(unique_embeddings) if not embedding]
+        missing_texts = [unique_texts[i] for i in missing]
+
+        # Split into smaller batches to avoid API limits, and embed a few of
+        # them at a time instead of awaiting each round-trip in turn
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+        results = await asyncio.gather(
+            *(
+                self._embed_sub_batch(missing_texts[i:i + MAX_BATCH_SIZE], i, semaphore)
+                for i in range(0, len(missing_texts), MAX_BATCH_SIZE)
+            )
+        )
+        fresh = [embedding for batch_embeddings in results for embedding in batch_embeddings]
+        for i, embedding in zip(missing, fresh):
+            unique_embeddings[i] = embedding
+            if embedding:
+                _embedding_cache.set(keys[i], tuple(embedding))
+        # A list per position, so duplicates don't share one mutable vector
+        all_embeddings = [list(unique_embeddings[i]) for i in order]
 
         success = sum(1 for e in all_embeddings if e)
         logger.info(
             "embed_batch: Complete",
             total=len(texts),
+            unique=len(unique_texts),
+            cached=len(unique_texts) - len(missing),
             success=success,
             failed=len(texts) - success,
         )
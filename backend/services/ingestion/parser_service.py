@@ -37,20 +37,22 @@ class DocumentParserService:
             # PDFs should arrive as pre-converted markdown from Marker.
             # If raw bytes are sent, attempt UTF-8 decode (user may have
             # pasted the markdown output). For true PDF binary, return error.
+            # Sniff the signature on the raw bytes so a real PDF is rejected
+            # without decoding megabytes of binary first.
+            if file_content.startswith(b"%PDF"):
+                return ParsedDocument(
+                    markdown_content="",
+                    metadata={
+                        "error": "raw_pdf_not_supported",
+                        "message": (
+                            "Raw PDF uploads are not supported. Please process "
+                            "the PDF through Marker first (use the Colab notebook "
+                            "or local pdf_ocr.py script) and upload the resulting markdown."
+                        ),
+                    },
+                )
             try:
                 text = file_content.decode("utf-8")
-                if text.startswith("%PDF"):
-                    return ParsedDocument(
-                        markdown_content="",
-                        metadata={
-                            "error": "raw_pdf_not_supported",
-                            "message": (
-                                "Raw PDF uploads are not supported. Please process "
-                                "the PDF through Marker first (use the Colab notebook "
-                                "or local pdf_ocr.py script) and upload the resulting markdown."
-                            ),
-                        },
-                    )
                 return ParsedDocument(
                     markdown_content=text,
                     metadata={"source": "pre_converted", "filename": filename},
@@ -0,0 +1,67 @@
+"""Bounded in-process cache with optional per-entry expiry.
+
+Module-level caches in the services are process-local (no Redis in this
+deployment), so each one needs a size cap and usually a TTL. This keeps
+eviction and expiry the same for all of them.
+"""
+
+import time
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Dict capped at ``max_entries`` whose entries expire after ``ttl_seconds``.
+
+    When full, the oldest inserted entry is dropped to make room; setting a
+    key again moves it to the newest position with a fresh expiry. Expired
+    entries are dropped when read. ``ttl_seconds=None`` keeps entries until
+    they are evicted or popped.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[K, tuple[float, V]] = {}
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))  # drop the oldest entry
+        expires_at = (
+            float("inf") if self.ttl_seconds is None else time.monotonic() + self.ttl_seconds
+        )
+        self._entries[key] = (expires_at, value)
+
+    def update(self, key: K, value: V) -> bool:
+        """Replace a live entry's value, keeping its expiry; False if there is none."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return False
+        self._entries[key] = (entry[0], value)
+        return True
+
+    def pop(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key) is not None  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return len(self._entries)
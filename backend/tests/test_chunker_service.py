@@ -0,0 +1,61 @@
+"""Tests for HierarchicalChunker page assignment."""
+
+from uuid import uuid4
+
+from langchain_core.documents import Document
+
+from backend.services.ingestion.chunker_service import HierarchicalChunker
+from backend.services.ingestion.parser_service import ParsedDocument
+
+PARA = "Gradient descent updates the weights against the gradient."
+
+
+def _chunk(text: str, **sizes) -> list[dict]:
+    chunker = HierarchicalChunker(**sizes)
+    return chunker.chunk(ParsedDocument(markdown_content=text, metadata={}), uuid4())
+
+
+def test_repeated_paragraphs_get_the_page_they_appear_on():
+    text = (
+        f"<!-- Page 1 -->\n{PARA}\n\n{PARA}\n\n"
+        f"<!-- Page 2 -->\n{PARA}\n\n"
+        f"<!-- Page 3 -->\n{PARA}"
+    )
+
+    chunks = _chunk(text, parent_size=70, child_size=30, overlap=0)
+
+    pages = [c["parent_page_start"] for c in chunks if c["parent_content"] == PARA]
+    assert pages == [1, 1, 2, 3]
+    for c in chunks:
+        assert c["parent_page_start"] == c["parent_page_end"]
+        assert set(c["child_page_starts"]) == {c["parent_page_start"]}
+
+
+def test_overlapping_parents_keep_their_own_pages():
+    # With overlap each parent starts inside the previous one. The parents'
+    # texts repeat, so every copy must map to the page it is on rather than to
+    # an earlier or later copy of the same text.
+    text = "".join(f"<!-- Page {n} -->\n" + "step " * 60 + "\n\n" for n in range(1, 5))
+
+    chunks = _chunk(text, parent_size=80, child_size=30, overlap=20)
+
+    pages = [c["parent_page_start"] for c in chunks]
+    assert pages == sorted(pages)
+    assert set(pages) == {1, 2, 3, 4}
+    for c in chunks:
+        assert c["child_page_starts"] == sorted(c["child_page_starts"])
+        assert c["parent_page_start"] <= min(c["child_page_starts"])
+        assert max(c["child_page_ends"]) <= c["parent_page_end"]
+
+
+def test_missing_start_index_falls_back_to_search():
+    text = f"<!-- Page 1 -->\n{PARA}\n\n<!-- Page 2 -->\nSomething else entirely."
+    chunker = HierarchicalChunker(parent_size=1000, child_size=1000, overlap=0)
+    chunker._parent_splitter.create_documents = lambda texts: [
+        Document(page_content="Something else entirely.")
+    ]
+
+    chunks = chunker.chunk(ParsedDocument(markdown_content=text, metadata={}), uuid4())
+
+    assert chunks[0]["parent_page_start"] == 2
+    assert chunks[0]["child_page_starts"] == [2]
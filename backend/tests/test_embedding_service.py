@@ -0,0 +1,100 @@
+"""Tests for EmbeddingService batching and fallback."""
+
+import asyncio
+
+import pytest
+
+from backend.services.ingestion import embedding_service as embedding_module
+from backend.services.ingestion.embedding_service import EmbeddingService
+from backend.services.ttl_cache import TTLCache
+
+
+class FakeEmbedder:
+    """Embeds "tN" as [N.0]; texts listed in ``fail`` make any call containing them fail."""
+
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.calls: list[list[str]] = []
+        self.in_flight = self.peak = 0
+
+    async def aembed_documents(self, texts, output_dimensionality=None):
+        self.calls.append(list(texts))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail.intersection(texts):
+                raise RuntimeError("embedding API error")
+            return [[float(t[1:])] for t in texts]
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(embedding_module, "get_embeddings", lambda: FakeEmbedder())
+    monkeypatch.setattr(embedding_module, "get_embedding_dims", lambda: 1)
+    monkeypatch.setattr(embedding_module, "MAX_RETRIES", 1)
+    # The embedding cache is module-level; keep it from leaking between tests
+    monkeypatch.setattr(
+        embedding_module,
+        "_embedding_cache",
+        TTLCache(embedding_module.EMBEDDING_CACHE_MAX_ENTRIES),
+    )
+    return EmbeddingService()
+
+
+async def test_embed_batch_runs_sub_batches_concurrently_in_order(service, monkeypatch):
+    monkeypatch.setattr(embedding_module, "MAX_BATCH_SIZE", 10)
+    texts = [f"t{i}" for i in range(95)]
+
+    embeddings = await service.embed_batch(texts)
+
+    assert embeddings == [[float(i)] for i in range(95)]
+    assert len(service.embedder.calls) == 10
+    assert service.embedder.peak == embedding_module.MAX_CONCURRENT_BATCHES
+
+
+async def test_failed_sub_batch_falls_back_per_text_and_keeps_slots(service, monkeypatch):
+    monkeypatch.setattr(embedding_module, "MAX_BATCH_SIZE", 10)
+    service.embedder.fail = {"t13"}
+    texts = [f"t{i}" for i in range(30)]
+
+    embeddings = await service.embed_batch(texts)
+
+    # Only t13 is lost; its slot holds the empty placeholder and nothing shifts
+    assert embeddings[13] == []
+    assert [e for i, e in enumerate(embeddings) if i != 13] == [
+        [float(i)] for i in range(30) if i != 13
+    ]
+    assert service.embedder.peak <= embedding_module.MAX_CONCURRENT_BATCHES
+
+
+async def test_embed_batch_sends_each_distinct_text_once(service):
+    texts = ["t1", "t2", "t1", "t3", "t2", "t1"]
+
+    embeddings = await service.embed_batch(texts)
+
+    assert embeddings == [[1.0], [2.0], [1.0], [3.0], [2.0], [1.0]]
+    assert [t for call in service.embedder.calls for t in call] == ["t1", "t2", "t3"]
+
+
+async def test_embed_batch_serves_repeat_texts_from_cache(service):
+    first = await service.embed_batch(["t1", "t2"])
+    second = await service.embed_batch(["t2", "t3"])
+
+    assert second == [[2.0], [3.0]]
+    assert service.embedder.calls == [["t1", "t2"], ["t3"]]
+
+    # Callers get their own lists; mutating one doesn't reach the cache
+    assert second[0] is not first[1]
+    second[0].append(99.0)
+    assert await service.embed_batch(["t2"]) == [[2.0]]
+
+
+async def test_failed_embeddings_are_not_cached(service):
+    service.embedder.fail = {"t4"}
+    assert await service.embed_batch(["t4"]) == [[]]
+
+    service.embedder.fail = set()
+    assert await service.embed_batch(["t4"]) == [[4.0]]
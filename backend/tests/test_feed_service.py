@@ -0,0 +1,855 @@
+"""Tests for FeedService query shaping and caching helpers."""
+
+import asyncio
+import re
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.models.feed_schemas import (
+    FeedFilterRequest,
+    FeedItem,
+    FeedItemType,
+    MCQOption,
+    MCQQuestion,
+)
+from backend.services import feed_service as feed_service_module
+from backend.services.feed_service import FeedService
+from backend.services import ttl_cache as ttl_cache_module
+from backend.services.ttl_cache import TTLCache
+
+DB_DIR = Path(__file__).resolve().parents[1] / "db"
+
+
+def _schema_columns(table: str) -> set[str]:
+    """Columns of ``table`` per init.sql plus the ADD COLUMNs in the migrations.
+
+    Query tests mock the client, so this is what catches SQL that names a
+    column the schema never had.
+    """
+    sql = "\n".join(
+        path.read_text()
+        for path in [DB_DIR / "init.sql", *sorted((DB_DIR / "migrations").glob("*.sql"))]
+    )
+    columns: set[str] = set()
+    create = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \((.*?)\n\);", sql, re.S)
+    if create:
+        for line in create.group(1).splitlines():
+            words = line.split()
+            if words and words[0].upper() not in {"CONSTRAINT", "PRIMARY", "UNIQUE", "FOREIGN", "--"}:
+                columns.add(words[0].lower())
+    for statement in sql.split(";"):
+        if re.search(rf"ALTER TABLE\s+{table}\b", statement):
+            columns.update(
+                c.lower() for c in re.findall(r"ADD COLUMN IF NOT EXISTS (\w+)", statement)
+            )
+    return columns
+
+
+@pytest.fixture
+def feed_service(mock_postgres_client, mock_neo4j_client):
+    return FeedService(mock_postgres_client, mock_neo4j_client)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_per_user_caches(monkeypatch):
+    # Per-user caches are module-level; keep them from leaking between tests
+    for name in (
+        "_mcq_cache",
+        "_generated_today",
+        "_feed_meta_cache",
+        "_domains_cache",
+        "_mastery_cache",
+        "_concept_cache",
+        "_cold_start_dynamic",
+    ):
+        cache = getattr(feed_service_module, name)
+        monkeypatch.setattr(
+            feed_service_module, name, TTLCache(cache.max_entries, cache.ttl_seconds)
+        )
+    monkeypatch.setattr(feed_service_module, "_cold_start_pending", set())
+    monkeypatch.setattr(feed_service_module, "_prefetch_pending", set())
+
+
+async def test_embed_questions_reuses_cached_embeddings(feed_service):
+    emb_service = AsyncMock()
+    emb_service.embed_batch = AsyncMock(return_value=[[1.0, 0.0], [0.0, 1.0]])
+    feed_service._embedding_service = emb_service
+
+    first = await feed_service._embed_questions(["What is X?", "What is Y?"])
+    second = await feed_service._embed_questions([" what is x? ", "What is Y?"])
+
+    assert first == [[1.0, 0.0], [0.0, 1.0]]
+    assert second == first
+    emb_service.embed_batch.assert_awaited_once()
+
+
+async def test_get_daily_activity_decodes_single_json_row(feed_service, mock_postgres_client):
+    mock_postgres_client.execute_query.return_value = [
+        {"activity": '[{"date": "2026-01-02", "reviews_completed": 3, "concepts_learned": 2,'
+                     ' "notes_added": 0, "accuracy": 0.5}]'}
+    ]
+
+    activity = await feed_service.get_daily_activity("user-1")
+
+    assert activity == [
+        {"date": "2026-01-02", "reviews_completed": 3, "concepts_learned": 2,
+         "notes_added": 0, "accuracy": 0.5}
+    ]
+
+
+async def test_is_duplicate_question_uses_stored_embeddings(feed_service, mock_postgres_client):
+    emb_service = AsyncMock()
+    emb_service.embed_batch = AsyncMock(return_value=[[1.0, 0.0]])
+    feed_service._embedding_service = emb_service
+    mock_postgres_client.execute_query.side_effect = [
+        [],  # no exact match
+        [{"id": "q1", "question_text": "What is Y?", "needs_embedding": False}],
+        [{"similarity": 0.91}],
+    ]
+
+    is_dup = await feed_service._is_duplicate_question("What is X?", "c1", "user-1")
+
+    assert is_dup is True
+    emb_service.embed_batch.assert_awaited_once_with(["What is X?"])
+    mock_postgres_client.execute_update.assert_not_awaited()
+
+
+async def test_is_duplicate_question_exact_match_skips_embedding(feed_service, mock_postgres_client):
+    emb_service = AsyncMock()
+    feed_service._embedding_service = emb_service
+    mock_postgres_client.execute_query.return_value = [{"?column?": 1}]
+
+    assert await feed_service._is_duplicate_question(" What is X? ", "c1", "user-1") is True
+    emb_service.embed_batch.assert_not_awaited()
+
+
+async def test_get_user_quizzes_normalizes_options(feed_service, mock_postgres_client):
+    options = [{"id": "A", "text": "x", "is_correct": True}]
+    mock_postgres_client.execute_query.return_value = [
+        {"id": "1", "options_json": options},
+        {"id": "2", "options_json": '[{"id": "A", "text": "x", "is_correct": true}]'},
+        {"id": "3", "options_json": "not json"},
+        {"id": "4", "options_json": None},
+    ]
+
+    quizzes = await feed_service.get_user_quizzes("user-1")
+
+    assert [q["options"] for q in quizzes] == [options, options, [], []]
+
+
+async def test_is_duplicate_question_skips_embedding_without_fuzzy_overlap(
+    feed_service, mock_postgres_client
+):
+    emb_service = AsyncMock()
+    feed_service._embedding_service = emb_service
+    mock_postgres_client.execute_query.side_effect = [
+        [],
+        [{"id": "q1", "question_text": "Which layer handles routing?", "needs_embedding": True}],
+    ]
+
+    is_dup = await feed_service._is_duplicate_question("Define gradient descent.", "c1", "user-1")
+
+    assert is_dup is False
+    emb_service.embed_batch.assert_not_awaited()
+
+
+def test_mcq_cache_roundtrip_by_mastery_bucket():
+    key = FeedService._mcq_cache_key("c1", 5, 0.1, [{"question": "Q"}])
+
+    assert FeedService._get_cached_mcq(key) is None
+    FeedService._cache_mcq(key, {"id": "q1", "question": "Q?"})
+
+    same_bucket = FeedService._mcq_cache_key("c1", 5, 0.2, [{"question": "Q"}])
+    assert FeedService._get_cached_mcq(same_bucket) == {"id": "q1", "question": "Q?"}
+    assert FeedService._mcq_cache_key("c1", 5, 0.9, [{"question": "Q"}]) != key
+
+
+async def test_single_flight_mcq_shares_one_generation():
+    calls = 0
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": "q1", "question": "Q?"}
+
+    first, second = await asyncio.gather(
+        FeedService._single_flight_mcq("key", generate),
+        FeedService._single_flight_mcq("key", generate),
+    )
+
+    assert calls == 1
+    assert first == second == {"id": "q1", "question": "Q?"}
+    assert feed_service_module._mcq_inflight == {}
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("llm down")
+
+    results = await asyncio.gather(
+        FeedService._single_flight_mcq("key", fail),
+        FeedService._single_flight_mcq("key", generate),
+        return_exceptions=True,
+    )
+    assert [type(r) for r in results] == [ValueError, RuntimeError]
+
+
+async def test_flush_pending_quizzes_bulk_inserts_then_caches(feed_service, mock_postgres_client):
+    mcq = MCQQuestion(
+        concept_id="c1",
+        question="What is X?",
+        options=[MCQOption(id="A", text="x", is_correct=True), MCQOption(id="B", text="y")],
+    )
+    content = {"question": mcq.question, "options": [o.model_dump() for o in mcq.options], "id": "q1"}
+
+    mock_postgres_client.execute_many.side_effect = RuntimeError("db down")
+    feed_service._persist_mcq("q1", "user-1", "c1", mcq, content, "key")
+    await feed_service._flush_pending_quizzes()
+    assert FeedService._get_cached_mcq("key") is None
+
+    mock_postgres_client.execute_many.side_effect = None
+    feed_service._persist_mcq("q1", "user-1", "c1", mcq, content, "key")
+    feed_service._persist_mcq("q2", "user-1", "c2", mcq, {**content, "id": "q2"})
+    await feed_service._flush_pending_quizzes()
+
+    rows = mock_postgres_client.execute_many.await_args.args[1]
+    assert [r["id"] for r in rows] == ["q1", "q2"]
+    assert rows[0]["correct_answer"] == "A"
+    assert FeedService._get_cached_mcq("key") == content
+    assert feed_service._pending_quiz_rows == []
+
+
+async def test_generated_today_is_seeded_once_then_bumped(
+    feed_service, mock_postgres_client, monkeypatch
+):
+    now = 1000.0
+    monkeypatch.setattr(ttl_cache_module.time, "monotonic", lambda: now)
+    mock_postgres_client.execute_query.return_value = [{"cnt": 3}]
+
+    assert await feed_service.get_generated_today("user-1") == 3
+    now += feed_service_module.GENERATED_TODAY_RESEED_SECONDS - 1
+    FeedService.record_generated("user-1", 2)
+    assert await feed_service.get_generated_today("user-1") == 5
+    mock_postgres_client.execute_query.assert_awaited_once()
+
+    # The bump kept the seed's expiry, so the count is re-read from SQL on time
+    now += 1
+    mock_postgres_client.execute_query.return_value = [{"cnt": 7}]
+    assert await feed_service.get_generated_today("user-1") == 7
+    assert mock_postgres_client.execute_query.await_count == 2
+
+
+def test_static_cold_start_items_get_fresh_ids(feed_service):
+    first = feed_service._static_cold_start_items()
+    second = feed_service._static_cold_start_items()
+
+    assert [i.concept_id for i in first] == [i.concept_id for i in second]
+    assert {i.id for i in first}.isdisjoint(i.id for i in second)
+
+
+async def test_find_similar_definition_mcq_respects_distance(feed_service, mock_postgres_client):
+    row = {
+        "concept_id": "c9",
+        "question_text": "What is X?",
+        "options_json": '[{"id": "A", "text": "x", "is_correct": true}]',
+        "explanation": "",
+    }
+    concept = {"id": "c9", "name": "X"}
+
+    mock_postgres_client.execute_query.return_value = [{**row, "distance": 0.05}]
+    mcq = await feed_service._find_similar_definition_mcq("user-1", [1.0, 0.0], concept)
+    assert mcq.question == "What is X?"
+    assert mcq.options[0].is_correct
+
+    mock_postgres_client.execute_query.return_value = [{**row, "distance": 0.4}]
+    assert await feed_service._find_similar_definition_mcq("user-1", [1.0, 0.0], concept) is None
+
+
+async def test_find_similar_definition_mcq_needs_same_concept_name(
+    feed_service, mock_postgres_client, mock_neo4j_client
+):
+    # Near-duplicate definitions: "Gradient Descent" vs "Stochastic Gradient Descent"
+    mock_postgres_client.execute_query.return_value = [{
+        "concept_id": "sgd",
+        "question_text": "Why sample mini-batches?",
+        "options_json": '[{"id": "A", "text": "x", "is_correct": true}]',
+        "explanation": "",
+        "distance": 0.04,
+    }]
+    concept = {"id": "gd", "name": "Gradient Descent"}
+
+    mock_neo4j_client.execute_query.return_value = [{"name": "Stochastic Gradient Descent"}]
+    assert await feed_service._find_similar_definition_mcq("user-1", [1.0, 0.0], concept) is None
+
+    # The same topic uploaded twice under a new id is still reused
+    mock_neo4j_client.execute_query.return_value = [{"name": "gradient  descent"}]
+    mcq = await feed_service._find_similar_definition_mcq("user-1", [1.0, 0.0], concept)
+    assert mcq.question == "Why sample mini-batches?"
+
+
+def test_dump_mcq_options_single_pass():
+    mcq = MCQQuestion(
+        concept_id="c1",
+        question="Q",
+        options=[MCQOption(id="A", text="a"), MCQOption(id="B", text="b", is_correct=True)],
+    )
+
+    options, correct = FeedService._dump_mcq_options(mcq)
+
+    assert options == [o.model_dump() for o in mcq.options]
+    assert correct == "B"
+
+
+async def test_get_daily_goal_combines_concurrent_counts(feed_service, mock_postgres_client):
+    feed_service.sr_service.get_due_items = AsyncMock(return_value=[{}, {}, {}])
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    mock_postgres_client.execute_query.return_value = [{"completed": 5, "adhoc": 2}]
+
+    assert await feed_service.get_daily_goal("user-1") == 3 + (5 - 2)
+    # Completed and ad-hoc counts come back from the same statement
+    mock_postgres_client.execute_query.assert_awaited_once()
+
+
+async def test_get_daily_goal_query_uses_existing_columns(feed_service, mock_postgres_client):
+    feed_service.sr_service.get_due_items = AsyncMock(return_value=[])
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    mock_postgres_client.execute_query.return_value = [{"completed": 0, "adhoc": 0}]
+
+    await feed_service.get_daily_goal("user-1")
+
+    query = mock_postgres_client.execute_query.await_args.args[0]
+    assert set(re.findall(r"\bs\.(\w+)", query)) <= _schema_columns("study_sessions")
+    assert set(re.findall(r"\bq\.(\w+)", query)) <= _schema_columns("quizzes")
+
+async def test_get_daily_goal_ignores_failed_session_counts(feed_service, mock_postgres_client):
+    feed_service.sr_service.get_due_items = AsyncMock(return_value=[{}])
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    mock_postgres_client.execute_query.side_effect = RuntimeError("db down")
+
+    assert await feed_service.get_daily_goal("user-1") == 1
+
+
+async def test_get_all_user_concepts_returns_flat_rows(feed_service, mock_neo4j_client):
+    rows = [{"id": "c1", "name": "X", "related_concepts": ["Y"]}]
+    mock_neo4j_client.execute_query.return_value = rows
+
+    assert await feed_service.get_all_user_concepts("user-1") == rows
+    query = mock_neo4j_client.execute_query.await_args.args[0]
+    assert "AS concept" not in query
+
+
+async def test_generate_feed_item_without_llm_skips_generation_prep(feed_service):
+    feed_service._get_db_content = AsyncMock(return_value=None)
+    feed_service._get_mastery_and_few_shots = AsyncMock()
+    concept = {"id": "c1", "name": "X", "definition": "An x."}
+
+    item = await feed_service.generate_feed_item(
+        "user-1", concept, FeedItemType.MCQ, allow_llm=False
+    )
+
+    assert item.item_type == FeedItemType.CONCEPT_SHOWCASE
+    feed_service._get_mastery_and_few_shots.assert_not_awaited()
+
+
+def test_feed_services_share_llm_agents(mock_postgres_client, mock_neo4j_client):
+    first = FeedService(mock_postgres_client, mock_neo4j_client)
+    second = FeedService(mock_postgres_client, mock_neo4j_client)
+
+    assert first.content_generator is second.content_generator
+    assert first.content_generator.llm is second.content_generator.llm
+    assert first.web_quiz_agent is second.web_quiz_agent
+
+
+async def test_call_llm_respects_concurrency_cap(feed_service, monkeypatch):
+    monkeypatch.setattr(feed_service_module, "_llm_semaphore", asyncio.Semaphore(2))
+    in_flight = peak = 0
+
+    async def generate(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return kwargs["n"]
+
+    results = await asyncio.gather(*(feed_service._call_llm(generate, n=i) for i in range(6)))
+
+    assert results == list(range(6))
+    assert peak == 2
+
+
+def test_utc_today_start_is_aware_midnight():
+    start = feed_service_module._utc_today_start()
+
+    assert start.tzinfo is not None and start.utcoffset().total_seconds() == 0
+    assert (start.hour, start.minute, start.second, start.microsecond) == (0, 0, 0, 0)
+    assert feed_service_module._utc_today_start() is start
+
+
+async def test_get_mastery_and_few_shots_single_query(feed_service, mock_postgres_client):
+    mock_postgres_client.execute_query.return_value = [
+        {"mastery": 0.6, "question_text": "Q1?", "options_json": '[{"id": "A"}]', "explanation": "e"},
+        {"mastery": 0.6, "question_text": "Q2?", "options_json": "not json", "explanation": ""},
+    ]
+
+    mastery, examples = await feed_service._get_mastery_and_few_shots("c1", "user-1")
+
+    assert mastery == 0.6
+    assert examples == [{"question": "Q1?", "options": [{"id": "A"}], "explanation": "e"}]
+    mock_postgres_client.execute_query.assert_awaited_once()
+
+    mock_postgres_client.execute_query.return_value = [
+        {"mastery": None, "question_text": None, "options_json": None, "explanation": None}
+    ]
+    assert await feed_service._get_mastery_and_few_shots("c1", "user-1") == (0.0, [])
+
+
+
+async def test_get_mastery_and_few_shots_bulk_groups_by_concept(feed_service, mock_postgres_client):
+    mock_postgres_client.execute_query.return_value = [
+        {"concept_id": "c1", "mastery": 0.6, "question_text": "Q1?", "options_json": "[]", "explanation": "e"},
+        {"concept_id": "c1", "mastery": 0.6, "question_text": "Q2?", "options_json": "[]", "explanation": ""},
+        {"concept_id": "c2", "mastery": None, "question_text": None, "options_json": None, "explanation": None},
+    ]
+
+    context = await feed_service._get_mastery_and_few_shots_bulk(["c1", "c2"], "user-1")
+
+    assert context["c1"][0] == 0.6
+    assert [e["question"] for e in context["c1"][1]] == ["Q1?", "Q2?"]
+    assert context["c2"] == (0.0, [])
+    mock_postgres_client.execute_query.assert_awaited_once()
+    assert await feed_service._get_mastery_and_few_shots_bulk([], "user-1") == {}
+
+
+async def test_generate_feed_item_uses_preloaded_mcq_context(feed_service):
+    feed_service._get_from_quiz_candidates = AsyncMock(return_value=None)
+    feed_service._get_mastery_and_few_shots = AsyncMock()
+    feed_service._single_flight_mcq = AsyncMock(return_value={"question": "Q?", "options": []})
+    concept = {"id": "c1", "name": "X", "definition": "An x."}
+
+    item = await feed_service.generate_feed_item(
+        "user-1", concept, FeedItemType.MCQ,
+        preloaded_content={}, preloaded_mcq_context={"c1": (0.5, [])},
+    )
+
+    assert item.content["question"] == "Q?"
+    feed_service._get_mastery_and_few_shots.assert_not_awaited()
+
+async def test_generate_content_batch_inserts_once_per_table(
+    feed_service, mock_postgres_client, mock_neo4j_client, monkeypatch
+):
+    mock_neo4j_client.execute_query.return_value = [{"id": "c1", "def": "An x.", "related": ["Y"]}]
+    research_agent = AsyncMock()
+    research_agent.research_topic.return_value = {"summary": ""}
+    monkeypatch.setattr(feed_service_module, "WebResearchAgent", lambda *args: research_agent)
+    feed_service.content_generator = AsyncMock()
+    feed_service.content_generator.generate_mixed_batch.return_value = [
+        {"type": "mcq", "content": {"question": "Q1?", "options": []}},
+        {"type": "fill_blank", "content": {"sentence": "_ is x", "answers": ["X"]}},
+        {"type": "term_card", "content": {"front": "X", "back": "An x."}},
+        {"type": "diagram", "content": {"mermaid_code": "graph TD"}},
+        {"type": "mcq", "content": None},
+    ]
+
+    result = await feed_service.generate_content_batch("X", "user-1")
+
+    assert result == {"status": "generated", "generated": 4}
+    batches = [call.args[1] for call in mock_postgres_client.execute_many.await_args_list]
+    assert [len(rows) for rows in batches] == [2, 1, 1]
+    assert batches[2][0]["ctype"] == "mermaid"
+    assert batches[0][0]["cid"] == "c1"
+    mixed_kwargs = feed_service.content_generator.generate_mixed_batch.await_args.kwargs
+    assert mixed_kwargs["related_concepts"] == ["Y"]
+    mock_postgres_client.execute_update.assert_not_awaited()
+
+
+async def test_get_feed_metadata_defaults_when_a_lookup_fails(feed_service, mock_postgres_client):
+    feed_service.get_due_concepts = AsyncMock(return_value=[{"id": "c1", "name": "X"}])
+    feed_service.get_generated_today = AsyncMock(return_value=20)
+    feed_service.sr_service.get_user_stats = AsyncMock(side_effect=RuntimeError("db down"))
+    feed_service.get_streak_and_completed_today = AsyncMock(return_value=(4, 2))
+    feed_service.get_user_domains = AsyncMock(return_value=["ML"])
+    mock_postgres_client.execute_query.return_value = []
+
+    response = await feed_service.get_feed(
+        FeedFilterRequest(user_id="user-1", item_types=[FeedItemType.MCQ], max_items=5)
+    )
+
+    assert (response.total_due_today, response.streak_days) == (0, 4)
+    assert (response.completed_today, response.domains) == (2, ["ML"])
+
+
+async def test_get_due_concepts_enriches_in_due_order(feed_service, mock_neo4j_client):
+    feed_service.sr_service.get_due_items = AsyncMock(return_value=[
+        {"sm2_data": {"item_id": "c2"}, "priority_score": 2.0},
+        {"sm2_data": {"item_id": "missing"}},
+        {"sm2_data": {"item_id": "c1"}, "priority_score": 1.0},
+    ])
+    mock_neo4j_client.execute_query.return_value = [
+        {"c": {"id": "c1", "name": "One"}},
+        {"c": {"id": "c2", "name": "Two"}},
+    ]
+
+    concepts = await feed_service.get_due_concepts("user-1")
+
+    assert [(c["name"], c["priority_score"]) for c in concepts] == [("Two", 2.0), ("One", 1.0)]
+    mock_neo4j_client.execute_query.assert_awaited_once()
+    assert mock_neo4j_client.execute_query.await_args.args[1]["concept_ids"] == ["c2", "missing", "c1"]
+
+
+async def test_get_due_concepts_only_fetches_uncached_concepts(feed_service, mock_neo4j_client):
+    feed_service.sr_service.get_due_items = AsyncMock(return_value=[
+        {"sm2_data": {"item_id": "c1"}},
+    ])
+    mock_neo4j_client.execute_query.return_value = [{"c": {"id": "c1", "name": "One"}}]
+    await feed_service.get_due_concepts("user-1")
+
+    feed_service.sr_service.get_due_items.return_value = [
+        {"sm2_data": {"item_id": "c1"}},
+        {"sm2_data": {"item_id": "c2"}},
+    ]
+    mock_neo4j_client.execute_query.return_value = [{"c": {"id": "c2", "name": "Two"}}]
+    concepts = await feed_service.get_due_concepts("user-1")
+
+    assert [c["name"] for c in concepts] == ["One", "Two"]
+    assert mock_neo4j_client.execute_query.await_args.args[1]["concept_ids"] == ["c2"]
+
+    await feed_service.get_due_concepts("user-1")
+    assert mock_neo4j_client.execute_query.await_count == 2
+
+
+async def test_get_feed_generates_items_concurrently(feed_service, mock_postgres_client):
+    concepts = [{"id": f"c{i}", "name": f"C{i}"} for i in range(3)]
+    feed_service.get_due_concepts = AsyncMock(return_value=concepts)
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    mock_postgres_client.execute_query.return_value = []
+    in_flight = peak = 0
+
+    async def generate(user_id, concept, item_type, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return FeedItem(item_type=item_type, content={"q": concept["id"]}, concept_id=concept["id"])
+
+    feed_service.generate_feed_item = generate
+
+    response = await feed_service.get_feed(
+        FeedFilterRequest(user_id="user-1", item_types=[FeedItemType.MCQ], max_items=10)
+    )
+
+    assert peak == 3
+    assert {i.concept_id for i in response.items} >= {"c0", "c1", "c2"}
+
+
+async def test_get_feed_prefetches_mcqs_for_unreached_concepts(feed_service, mock_postgres_client):
+    concepts = [{"id": f"c{i}", "name": f"C{i}"} for i in range(8)]
+    feed_service.get_due_concepts = AsyncMock(return_value=concepts)
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    bulk_lookups = []
+
+    async def execute_query(query, params=None):
+        if "FROM quizzes" in query and "cids" in params:
+            return [{"id": "q7", "question_text": "Q", "question_type": "mcq", "concept_id": "c7"}]
+        if "DISTINCT ON" in query:
+            bulk_lookups.append(params["concept_ids"])
+            if "c6" in params["concept_ids"]:
+                return [{"concept_id": "c6", "id": "q6", "question_text": "Q",
+                         "options_json": [], "explanation": ""}]
+        return []
+
+    mock_postgres_client.execute_query.side_effect = execute_query
+    calls = []
+
+    async def generate(user_id, concept, item_type, **kwargs):
+        calls.append((concept["id"], item_type, kwargs.get("defer_save")))
+        return None
+
+    feed_service.generate_feed_item = generate
+
+    await feed_service.get_feed(
+        FeedFilterRequest(user_id="user-1", item_types=[FeedItemType.MCQ], max_items=10)
+    )
+    await asyncio.gather(*feed_service_module._background_tasks)
+
+    # c0-c4 were generated for this feed; c6 and c7 already have stored quizzes
+    prefetched = [c for c in calls if c[0] in {"c5", "c6", "c7"}]
+    assert prefetched == [("c5", FeedItemType.MCQ, True)]
+    assert bulk_lookups[-1] == ["c5", "c6"]
+    assert "user-1" not in feed_service_module._prefetch_pending
+
+
+async def test_get_feed_preloads_stored_content_in_one_query(feed_service, mock_postgres_client):
+    concepts = [{"id": f"c{i}", "name": f"C{i}"} for i in range(3)]
+    feed_service.get_due_concepts = AsyncMock(return_value=concepts)
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    stored = [{"concept_id": "c1", "id": "q1", "question_text": "Q1?", "options_json": "[]", "explanation": "E"}]
+    mock_postgres_client.execute_query.side_effect = [[], [], stored, []]
+    preloads = []
+
+    async def generate(user_id, concept, item_type, preloaded_content=None, **kwargs):
+        preloads.append(preloaded_content)
+        return None
+
+    feed_service.generate_feed_item = generate
+
+    await feed_service.get_feed(
+        FeedFilterRequest(user_id="user-1", item_types=[FeedItemType.MCQ], max_items=3)
+    )
+
+    bulk = mock_postgres_client.execute_query.await_args_list[2]
+    assert bulk.args[1]["concept_ids"] == ["c0", "c1", "c2"]
+    assert preloads[0]["c1"]["question"] == "Q1?"
+    assert all(p is preloads[0] for p in preloads[:3])
+
+
+async def test_get_feed_fetches_uploads_while_generating(feed_service, mock_postgres_client):
+    feed_service.get_due_concepts = AsyncMock(return_value=[{"id": "c1", "name": "C1"}])
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    mock_postgres_client.execute_query.return_value = []
+    events = []
+
+    async def uploads(user_id, limit):
+        events.append("uploads")
+        return [{"id": "u1", "upload_type": "screenshot", "title": "Shot",
+                 "created_at": datetime(2026, 1, 2, tzinfo=timezone.utc)}]
+
+    async def generate(user_id, concept, item_type, **kwargs):
+        await asyncio.sleep(0)
+        events.append("generated")
+        return None
+
+    feed_service.get_user_uploads = uploads
+    feed_service.generate_feed_item = generate
+
+    response = await feed_service.get_feed(
+        FeedFilterRequest(
+            user_id="user-1",
+            item_types=[FeedItemType.MCQ, FeedItemType.SCREENSHOT],
+            max_items=10,
+        )
+    )
+
+    assert events == ["uploads", "generated"]
+    assert "u1" in {i.id for i in response.items}
+
+
+async def test_get_feed_uploads_only_fill_open_slots(feed_service, mock_postgres_client):
+    concepts = [{"id": f"c{i}", "name": f"C{i}"} for i in range(4)]
+    feed_service.get_due_concepts = AsyncMock(return_value=concepts)
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    mock_postgres_client.execute_query.return_value = []
+    feed_service.get_user_uploads = AsyncMock(return_value=[
+        {"id": f"u{i}", "upload_type": "screenshot", "title": f"Shot {i}"} for i in range(1, 4)
+    ])
+
+    async def generate(user_id, concept, item_type, **kwargs):
+        return FeedItem(
+            item_type=item_type, content={}, concept_id=concept["id"], priority_score=0.1
+        )
+
+    feed_service.generate_feed_item = generate
+
+    response = await feed_service.get_feed(
+        FeedFilterRequest(
+            user_id="user-1",
+            item_types=[FeedItemType.MCQ, FeedItemType.SCREENSHOT],
+            max_items=6,
+        )
+    )
+
+    # Four items leave two of six slots; uploads don't displace due items
+    assert {i.id for i in response.items if i.item_type == FeedItemType.SCREENSHOT} == {"u1", "u2"}
+    assert any(i.concept_id in {"c0", "c1", "c2", "c3"} for i in response.items)
+
+
+async def test_get_user_domains_cached_per_user(feed_service, mock_neo4j_client):
+    mock_neo4j_client.execute_query.return_value = [{"domain": "ML"}, {"domain": None}]
+
+    assert await feed_service.get_user_domains("user-1") == ["ML"]
+    assert await feed_service.get_user_domains("user-1") == ["ML"]
+    mock_neo4j_client.execute_query.assert_awaited_once()
+
+    await feed_service.get_user_domains("user-2")
+    assert mock_neo4j_client.execute_query.await_count == 2
+
+
+async def test_get_domain_mastery_cached_until_interaction(
+    feed_service, mock_neo4j_client, mock_postgres_client
+):
+    scans = 0
+
+    async def stream_query(query, params):
+        nonlocal scans
+        scans += 1
+        for row in ({"id": "c1", "domain": "ML"}, {"id": "c2", "domain": "ML"}):
+            yield row
+
+    mock_neo4j_client.stream_query = stream_query
+    mock_postgres_client.execute_query.return_value = [{"domain": "ML", "avg_score": 0.25}]
+
+    assert await feed_service.get_domain_mastery("user-1") == {"ML": 25.0}
+    assert await feed_service.get_domain_mastery("user-1") == {"ML": 25.0}
+    assert scans == 1
+    # Postgres averages per domain over the concepts Neo4j returned
+    params = mock_postgres_client.execute_query.await_args.args[1]
+    assert (params["concept_ids"], params["domains"]) == (["c1", "c2"], ["ML", "ML"])
+
+    await feed_service.record_interaction("user-1", "q1", "quiz", "c1", "answer", is_correct=True)
+    await feed_service.get_domain_mastery("user-1")
+    assert scans == 2
+
+
+async def test_get_user_streak_counts_consecutive_days(feed_service, mock_postgres_client):
+    # "today" is the database's CURRENT_DATE, whatever the app server's clock says
+    today = date(2024, 3, 10)
+
+    def days(*offsets):
+        return [{"activity_date": today - timedelta(days=o), "today": today} for o in offsets]
+
+    mock_postgres_client.execute_query.return_value = days(0, 1, 2, 4)
+    assert await feed_service.get_user_streak("user-1") == 3
+
+    mock_postgres_client.execute_query.return_value = days(1, 2)
+    assert await feed_service.get_user_streak("user-1") == 2
+
+    mock_postgres_client.execute_query.return_value = days(2, 3)
+    assert await feed_service.get_user_streak("user-1") == 0
+
+    mock_postgres_client.execute_query.return_value = []
+    assert await feed_service.get_user_streak("user-1") == 0
+
+
+async def test_feed_metadata_shared_between_concurrent_callers(feed_service):
+    feed_service.sr_service.get_user_stats = AsyncMock(return_value={"due_today": 3})
+    feed_service.get_streak_and_completed_today = AsyncMock(return_value=(2, 1))
+    feed_service.get_user_domains = AsyncMock(return_value=["ML"])
+
+    first, second = await asyncio.gather(
+        feed_service._get_feed_metadata("user-1"),
+        feed_service._get_feed_metadata("user-1"),
+    )
+
+    assert first == second == ({"due_today": 3}, 2, 1, ["ML"])
+    feed_service.get_streak_and_completed_today.assert_awaited_once()
+
+    await feed_service.record_interaction("user-1", "q1", "quiz", "c1", "answer", True)
+    await feed_service._get_feed_metadata("user-1")
+    assert feed_service.get_streak_and_completed_today.await_count == 2
+
+
+async def test_record_interaction_stores_row_before_returning(feed_service, mock_postgres_client):
+    feed_service_module._feed_meta_cache.set("user-1", asyncio.Future())
+    feed_service_module._mastery_cache.set("user-1", {"ML": 50.0})
+
+    await feed_service.record_interaction("user-2", "f1", "flashcard", "c2", "view")
+    await feed_service.record_interaction("user-1", "q1", "quiz", "c1", "answer", True)
+
+    assert mock_postgres_client.execute_update.await_count == 2
+    params = mock_postgres_client.execute_update.await_args.args[1]
+    assert (params["user_id"], params["session_type"]) == ("user-1", "quiz")
+    # Caches are dropped by the time the call returns, so the next /feed or /stats is fresh
+    assert "user-1" not in feed_service_module._feed_meta_cache
+    assert "user-1" not in feed_service_module._mastery_cache
+
+
+async def test_ensure_weekly_buffer_probes_at_most_twenty_rows(
+    feed_service, mock_postgres_client, mock_neo4j_client
+):
+    mock_neo4j_client.execute_query.return_value = [{"name": "X"}]
+    feed_service.generate_content_batch = AsyncMock()
+
+    mock_postgres_client.execute_query.return_value = [{"x": 1}] * 20
+    await feed_service.ensure_weekly_buffer("user-1")
+    feed_service.generate_content_batch.assert_not_awaited()
+    assert "LIMIT 20" in mock_postgres_client.execute_query.await_args.args[0]
+
+    mock_postgres_client.execute_query.return_value = [{"x": 1}] * 3
+    await feed_service.ensure_weekly_buffer("user-1")
+    feed_service.generate_content_batch.assert_awaited_once_with("X", "user-1", target_size=15)
+
+
+async def test_get_feed_keeps_top_priority_items_after_demo_cards(feed_service, mock_postgres_client):
+    concepts = [{"id": f"c{i}", "name": f"C{i}", "priority_score": float(i)} for i in range(5)]
+    feed_service.get_due_concepts = AsyncMock(return_value=concepts)
+    feed_service.get_generated_today = AsyncMock(return_value=0)
+    mock_postgres_client.execute_query.return_value = []
+
+    async def generate(user_id, concept, item_type, **kwargs):
+        return FeedItem(
+            item_type=item_type,
+            content={},
+            concept_id=concept["id"],
+            priority_score=concept["priority_score"],
+        )
+
+    feed_service.generate_feed_item = generate
+    demo_count = len(feed_service_module._DEMO_ITEMS)
+
+    response = await feed_service.get_feed(
+        FeedFilterRequest(user_id="user-1", item_types=[FeedItemType.MCQ], max_items=demo_count + 2)
+    )
+
+    demo_templates = feed_service_module._DEMO_ITEMS
+    demos = response.items[:demo_count]
+    assert [i.concept_id for i in demos] == [i.concept_id for i in demo_templates]
+    assert [i.concept_id for i in response.items[demo_count:]] == ["c4", "c3"]
+
+    # Each response gets its own demo ids, so interactions aren't merged across feeds
+    again = await feed_service.get_feed(
+        FeedFilterRequest(user_id="user-1", item_types=[FeedItemType.MCQ], max_items=demo_count + 2)
+    )
+    assert {i.id for i in demos}.isdisjoint(i.id for i in again.items[:demo_count])
+    assert all(d.id.startswith(t.id) for d, t in zip(demos, demo_templates))
+
+
+async def test_cold_start_feed_returns_static_items_and_generates_in_background(feed_service):
+    mcq_item = FeedItem(item_type=FeedItemType.MCQ, content={"question": "Q?"})
+    feed_service.generate_feed_item = AsyncMock(return_value=mcq_item)
+    request = FeedFilterRequest(user_id="user-1")
+    static_count = len(feed_service_module._COLD_START_ITEMS)
+
+    first = await feed_service.generate_cold_start_feed(request)
+    assert len(first.items) == static_count
+
+    await asyncio.gather(*feed_service_module._background_tasks)
+    second = await feed_service.generate_cold_start_feed(request)
+
+    assert second.items[-1] is mcq_item
+    feed_service.generate_feed_item.assert_awaited_once()
+
+
+async def test_get_feed_upload_items_default_missing_fields(feed_service, mock_postgres_client):
+    feed_service.get_due_concepts = AsyncMock(return_value=[{"id": "c1", "name": "C1"}])
+    feed_service.get_generated_today = AsyncMock(return_value=20)
+    feed_service.get_user_uploads = AsyncMock(return_value=[
+        {"upload_type": "screenshot", "title": "Shot", "created_at": None}
+    ])
+    mock_postgres_client.execute_query.return_value = []
+
+    response = await feed_service.get_feed(
+        FeedFilterRequest(user_id="user-1", item_types=[FeedItemType.SCREENSHOT], max_items=10)
+    )
+
+    upload = response.items[-1]
+    assert upload.concept_name == "Shot"
+    assert upload.id and upload.created_at is not None
+    assert response.model_dump(mode="json")["items"][-1]["item_type"] == "screenshot"
+
+
+async def test_get_streak_and_completed_today_single_query(feed_service, mock_postgres_client):
+    today = date(2024, 3, 10)
+    mock_postgres_client.execute_query.return_value = [
+        {
+            "completed": 7,
+            "today": today,
+            "dates": [today, today - timedelta(days=1), today - timedelta(days=3)],
+        }
+    ]
+
+    assert await feed_service.get_streak_and_completed_today("user-1") == (2, 7)
+    mock_postgres_client.execute_query.assert_awaited_once()
@@ -146,3 +146,33 @@ class TestSynthesisAgent:
             vec_zero = [0.0, 0.0, 0.0]
             similarity = agent._cosine_similarity(vec1, vec_zero)
             assert similarity == 0.0
+
+    @pytest.mark.asyncio
+    async def test_existing_embeddings_are_normalized_once(self):
+        """Existing concept vectors are unit-normalized when embedded, and the
+        dot-product similarity matches the cosine similarity."""
+        with patch.object(SynthesisAgent, "__init__", lambda self, **kwargs: None):
+            agent = SynthesisAgent()
+            agent.embeddings = AsyncMock()
+            agent.embeddings.aembed_documents = AsyncMock(
+                return_value=[[3.0, 4.0, 0.0], [0.0, 0.0, 0.0]]
+            )
+            agent.embeddings.aembed_query = AsyncMock(return_value=[6.0, 8.0, 0.0])
+
+            existing = [
+                {"id": "e1", "name": "A", "definition": "a"},
+                {"id": "e2", "name": "B", "definition": "b"},
+            ]
+            with_embeddings = await agent._embed_existing_concepts(existing)
+
+            assert with_embeddings[0][1] == pytest.approx([0.6, 0.8, 0.0])
+            assert with_embeddings[1][1] == [0.0, 0.0, 0.0]
+
+            similar = await agent._find_similar_concepts(
+                {"name": "C", "definition": "c"}, with_embeddings
+            )
+
+            assert [s["id"] for s in similar] == ["e1"]
+            assert similar[0]["similarity"] == pytest.approx(
+                agent._cosine_similarity([6.0, 8.0, 0.0], [3.0, 4.0, 0.0])
+            )
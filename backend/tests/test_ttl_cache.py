@@ -0,0 +1,53 @@
+"""Tests for the bounded TTL cache shared by the service-level caches."""
+
+from backend.services import ttl_cache as ttl_cache_module
+from backend.services.ttl_cache import TTLCache
+
+
+def test_full_cache_drops_oldest_entry():
+    cache = TTLCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)  # re-setting moves "a" to the newest slot
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (10, 3)
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(ttl_cache_module.time, "monotonic", lambda: now)
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", [1])
+
+    now = 1059.0
+    assert cache.get("a") == [1]
+    now = 1060.0
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert len(cache) == 0
+
+
+def test_no_ttl_keeps_entries_until_popped():
+    cache = TTLCache(max_entries=10)
+    cache.set("a", 0)
+
+    assert "a" in cache
+    assert cache.pop("a") == 0
+    assert cache.pop("a", "gone") == "gone"
+
+
+def test_update_keeps_expiry(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(ttl_cache_module.time, "monotonic", lambda: now)
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+
+    assert cache.update("a", 1) is False
+    cache.set("a", 1)
+    now = 1030.0
+    assert cache.update("a", 2) is True
+    assert cache.get("a") == 2
+    now = 1060.0
+    assert cache.get("a") is None